@@ -0,0 +1,304 @@
+# Noyaux de génération sur indices de cellules, pilotés par un générateur
+# aléatoire random.Random explicite ou par le module random lui-même : fusion,
+# exploration et wilson y tirent dans le même ordre que les générateurs de Maze
+# appelés sans seed ni rng, qui passent donc aussi par eux.
+# Chaque noyau reçoit l'index de grille (GridIndex) de la forme voulue et
+# retourne le stockage de cellules (un octet par cellule, bits EAST et SOUTH).
+# Les tirages sont faits en bloc quand l'algorithme le permet.
+from random import Random
+
+from app.GridIndex import LEFT, MOVES, GridIndex
+from app.Maze import EAST, SOUTH
+from app.UnionFind import UnionFind
+from app.WallIndex import WallIndex
+
+# Version des noyaux : à incrémenter dès qu'un noyau change ses tirages,
+# ce qui invalide les labyrinthes enregistrés par MazeCache
+VERSION = 1
+
+# Pile ou face sur le bit de poids faible d'un octet aléatoire
+_COIN_SOUTH_OR_EAST = bytes(SOUTH if b & 1 else EAST for b in range(256))
+_COIN_CLOSE         = bytes(b & 1 for b in range(256))
+_COIN_EAST          = bytes(0 if b & 1 else EAST for b in range(256))
+
+
+def btree(index: GridIndex, rng) -> bytearray:
+    """
+    Arbre binaire : un octet aléatoire par cellule, converti en passage sud ou est
+    par une table, puis les bords sud et est de la grille sont corrigés en bloc
+    """
+    height, width = index.height, index.width
+    if index.size == 0:
+        return bytearray()
+    cells = bytearray(rng.randbytes(index.size).translate(_COIN_SOUTH_OR_EAST))
+    # Dernière colonne : seul le sud est possible ; dernière ligne : seul l'est
+    cells[width-1::width] = bytes([SOUTH]) * height
+    cells[(height-1)*width:] = bytes([EAST]) * (width-1) + bytes(1)
+    return cells
+
+
+def sidewinder(index: GridIndex, rng) -> bytearray:
+    """
+    Sidewinder : les pièces d'une ligne sont tirées en un bloc, les passages à l'est
+    s'en déduisent par une table, et on ne fait un tirage individuel qu'une fois par séquence
+    """
+    height, width = index.height, index.width
+    cells = bytearray(index.size)
+    if index.size == 0:
+        return cells
+    for i in range(height-1):
+        cells[i*width:(i+1)*width] = sidewinder_row(width, rng)
+
+    # On casse tous les murs à l'est de la dernière ligne
+    last = (height-1)*width
+    cells[last:last+width-1] = bytes([EAST]) * (width-1)
+    return cells
+
+
+def sidewinder_row(width: int, rng) -> bytes:
+    """
+    Une ligne de sidewinder (hors dernière ligne), tirée avec rng
+    """
+    coins = rng.randbytes(width-1)
+    # Tant que la séquence continue (pile), on casse le mur à l'est
+    row = bytearray(coins.translate(_COIN_EAST) + b"\x00")
+    # Sur face, la séquence se ferme ; la dernière colonne ferme toujours
+    closes = coins.translate(_COIN_CLOSE) + b"\x01"
+    randrange = rng.randrange
+    start = 0
+    end = closes.find(1)
+    while end >= 0:
+        row[start + randrange(end - start + 1)] |= SOUTH
+        start = end + 1
+        end = closes.find(1, start)
+    return row
+
+
+def btree_row(width: int, rng) -> bytes:
+    """
+    Une ligne d'arbre binaire (hors dernière ligne), tirée avec rng
+    """
+    row = bytearray(rng.randbytes(width).translate(_COIN_SOUTH_OR_EAST))
+    # Dernière colonne : seul le sud est possible
+    row[-1] = SOUTH
+    return row
+
+
+def fusion(index: GridIndex, rng) -> bytearray:
+    """
+    Fusion de chemins : murs de la grille pleine (construits par l'index) mélangés,
+    labels gérés par Union-Find
+    """
+    width = index.width
+    cells = bytearray(index.size)
+    labels = UnionFind(index.size)
+    walls = index.walls()
+    rng.shuffle(walls)
+    union = labels.union
+    for w in walls:
+        k = w >> 1
+        if w & 1:
+            if union(k, k+width):
+                cells[k] |= SOUTH
+        elif union(k, k+1):
+            cells[k] |= EAST
+    return cells
+
+
+def exploration(index: GridIndex, rng) -> bytearray:
+    """
+    Exploration exhaustive : pile d'indices et table des directions de l'index
+    """
+    n = index.size
+    cells = bytearray(n)
+    if n == 0:
+        return cells
+    offsets = index.offsets
+    mask = index.mask
+    choice = rng.choice
+
+    cell = rng.randrange(n)
+    visited = bytearray(n)
+    visited[cell] = 1
+    stack = [cell]
+    while stack:
+        c = stack[-1]
+        possible = [d for d in MOVES[mask[c]] if not visited[c + offsets[d]]]
+        if possible:
+            d = choice(possible)
+            nxt = c + offsets[d]
+            # On casse le mur côté cellule du haut (sud) ou de gauche (est)
+            if d & 2:
+                cells[min(c, nxt)] |= EAST
+            else:
+                cells[min(c, nxt)] |= SOUTH
+            visited[nxt] = 1
+            stack.append(nxt)
+        else:
+            stack.pop()
+    return cells
+
+
+def wilson(index: GridIndex, rng) -> bytearray:
+    """
+    Wilson : marche aléatoire effacée de ses boucles, une direction mémorisée par cellule
+    """
+    n = index.size
+    cells = bytearray(n)
+    if n == 0:
+        return cells
+    offsets = index.offsets
+    mask = index.mask
+    choice = rng.choice
+    getrandbits = rng.getrandbits
+    directions = bytearray(n)
+
+    visited = bytearray(n)
+    visited[rng.randrange(n)] = 1
+    remaining = n-1
+    start = 0
+    while remaining:
+        while visited[start]:
+            start += 1
+
+        c = start
+        while not visited[c]:
+            possible = MOVES[mask[c]]
+            d = possible[getrandbits(2)] if len(possible) == 4 else choice(possible)
+            directions[c] = d
+            c += offsets[d]
+
+        c = start
+        while not visited[c]:
+            visited[c] = 1
+            remaining -= 1
+            nxt = c + offsets[directions[c]]
+            if directions[c] & 2:
+                cells[min(c, nxt)] |= EAST
+            else:
+                cells[min(c, nxt)] |= SOUTH
+            c = nxt
+    return cells
+
+
+def eller_rows(height: int, width: int, rng):
+    """
+    Eller, ligne par ligne : produit les octets de chaque ligne (bits EAST et SOUTH)
+    en ne gardant que l'ensemble (label) de chaque cellule de la ligne courante.
+    La mémoire ne dépend que de width, height peut être aussi grand qu'on veut.
+    """
+    labels = list(range(width))
+    next_label = width
+    for i in range(height):
+        last = i == height-1
+        row = bytearray(width)
+
+        # Cellules de chaque ensemble de la ligne, dans l'ordre des colonnes
+        members = {}
+        for j, label in enumerate(labels):
+            members.setdefault(label, []).append(j)
+
+        # Fusions horizontales au hasard (toutes celles possibles sur la dernière ligne) :
+        # on renomme l'ensemble le plus petit
+        joins = rng.getrandbits(width) if width else 0
+        for j in range(width-1):
+            a, b = labels[j], labels[j+1]
+            if a != b and (last or joins >> j & 1):
+                row[j] |= EAST
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                moved = members.pop(b)
+                for c in moved:
+                    labels[c] = a
+                members[a] += moved
+
+        if not last:
+            # Chaque ensemble descend par au moins une de ses cellules ; les autres cellules
+            # de la ligne suivante commencent dans un nouvel ensemble
+            drops = rng.getrandbits(width)
+            below = [-1] * width
+            for label, columns in members.items():
+                down = [c for c in columns if drops >> c & 1]
+                if not down:
+                    down = [columns[rng.randrange(len(columns))]]
+                for c in down:
+                    row[c] |= SOUTH
+                    below[c] = label
+            for j in range(width):
+                if below[j] < 0:
+                    below[j] = next_label
+                    next_label += 1
+            labels = below
+        yield bytes(row)
+
+
+def eller(index: GridIndex, rng) -> bytearray:
+    """
+    Eller : assemblage des lignes produites par eller_rows
+    """
+    return bytearray(b"".join(eller_rows(index.height, index.width, rng)))
+
+
+def prim(index: GridIndex, rng) -> bytearray:
+    """
+    Prim randomisé : la frontière est l'ensemble des murs qui séparent une cellule
+    visitée d'une cellule non visitée, rangé dans un WallIndex (retrait et tirage en O(1))
+    """
+    n = index.size
+    cells = bytearray(n)
+    if n == 0:
+        return cells
+    width = index.width
+    offsets = index.offsets
+    mask = index.mask
+    visited = bytearray(n)
+    frontier = WallIndex(n, ())
+
+    c = rng.randrange(n)
+    while True:
+        visited[c] = 1
+        # Les murs vers les voisines déjà visitées quittent la frontière, les autres y entrent
+        for d in MOVES[mask[c]]:
+            nxt = c + offsets[d]
+            code = 2*min(c, nxt) + (d < LEFT)
+            if visited[nxt]:
+                frontier.discard(code)
+            else:
+                frontier.add(code)
+        if not len(frontier):
+            return cells
+
+        # On casse un mur de la frontière tiré au hasard et on visite la cellule qu'il fermait
+        code = frontier.sample(rng)
+        frontier.discard(code)
+        k = code >> 1
+        if code & 1:
+            cells[k] |= SOUTH
+            other = k + width
+        else:
+            cells[k] |= EAST
+            other = k + 1
+        c = k if visited[other] else other
+
+
+# Noyau associé à chaque générateur de Maze
+KERNELS = {
+    "gen_btree": btree,
+    "gen_sidewinder": sidewinder,
+    "gen_fusion": fusion,
+    "gen_exploration": exploration,
+    "gen_wilson": wilson,
+    "gen_eller": eller,
+    "gen_prim": prim,
+}
+
+
+def generate_chunk(algorithm: str, height: int, width: int, seed: int, count: int) -> list:
+    """
+    Génère count labyrinthes avec un même générateur aléatoire initialisé par seed
+    et retourne leurs stockages de cellules (point d'entrée des processus de generate_batch)
+    """
+    kernel = KERNELS[algorithm]
+    index = GridIndex.of(height, width)
+    rng = Random(seed)
+    return [kernel(index, rng) for _ in range(count)]
@@ -0,0 +1,87 @@
+from array import array
+from functools import cached_property, lru_cache
+
+# Codes des directions, dans l'ordre de get_contiguous_cells, et bit correspondant dans un masque
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+
+# Directions présentes dans chacun des 16 masques possibles, par ordre croissant
+MOVES = tuple(tuple(d for d in range(4) if mask >> d & 1) for mask in range(16))
+
+
+class GridIndex:
+    """
+    Classe Index de grille
+    Tables d'adjacence d'une forme de labyrinthe (height x width), qui ne
+    dépendent pas des murs et sont donc partagées par tous les labyrinthes
+    de même forme. Les cellules sont désignées par leur cell_id (l*width + c)
+    et les directions par un code, dans l'ordre de get_contiguous_cells :
+    UP (0), DOWN (1), LEFT (2), RIGHT (3).
+    La voisine de la cellule k dans la direction d est k + offsets[d] ;
+    mask[k] indique (bit d) les directions qui restent dans la grille,
+    et MOVES[mask[k]] en donne la liste.
+    On obtient l'index d'une forme avec GridIndex.of(height, width), mis en cache.
+    """
+    def __init__(self, height: int, width: int):
+        """
+        Constructeur des tables d'une grille de height x width cellules
+        """
+        self.height  = height
+        self.width   = width
+        self.size    = height*width
+        self.offsets = (-width, width, -1, 1)
+
+    @cached_property
+    def mask(self) -> bytes:
+        """
+        Masque de chaque cellule selon les bords qu'elle touche, assemblé ligne par ligne
+        (construit au premier usage : les offsets suffisent aux labyrinthes procéduraux)
+        """
+        height, width = self.height, self.width
+
+        def row_mask(vertical: int) -> bytes:
+            if width == 1:
+                return bytes([vertical])
+            left, right = 1 << LEFT, 1 << RIGHT
+            return bytes([vertical | right]) + bytes([vertical | left | right])*(width-2) + bytes([vertical | left])
+
+        up, down = 1 << UP, 1 << DOWN
+        if height == 0 or width == 0:
+            return b""
+        if height == 1:
+            return row_mask(0)
+        return row_mask(down) + row_mask(up | down)*(height-2) + row_mask(up)
+
+    def walls(self) -> array:
+        """
+        Retourne un nouveau tableau des murs intérieurs d'un labyrinthe plein, dans l'ordre
+        de get_walls et codés comme Maze._wall_codes (2*k pour le mur à l'est de k, 2*k+1
+        pour le mur au sud de k). Il n'est pas gardé par l'index : à 16 octets par cellule,
+        il retiendrait bien plus de mémoire que les labyrinthes eux-mêmes.
+        """
+        height, width = self.height, self.width
+        walls = array('l')
+        for i in range(height):
+            row = 2*i*width
+            if i < height-1:
+                walls.extend(code for j in range(width) for code in (row + 2*j, row + 2*j + 1))
+                if width:
+                    # La dernière colonne n'a pas de mur à l'est
+                    del walls[-2]
+            else:
+                walls.extend(range(row, row + 2*(width-1), 2))
+        return walls
+
+    def contiguous(self, k: int) -> list:
+        """
+        Retourne les indices des cellules contiguës à la cellule d'indice k
+        """
+        offsets = self.offsets
+        return [k + offsets[d] for d in MOVES[self.mask[k]]]
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def of(height: int, width: int):
+        """
+        Retourne l'index (partagé) de la forme height x width
+        """
+        return GridIndex(height, width)
@@ -0,0 +1,171 @@
+# Export d'un labyrinthe en image (PBM, PGM ou PNG), pour les grilles trop grandes
+# pour le rendu texte. Les lignes de pixels sont produites une à une à partir des
+# octets d'une ligne de cellules, par des découpages et des tables de traduction
+# (sans boucle Python par pixel) : la mémoire est bornée par une ligne de pixels.
+#
+# Chaque cellule occupe cell_px x cell_px pixels : la première ligne et la première
+# colonne de ce carré portent ses murs nord et ouest (le coin est toujours un mur),
+# le reste est l'intérieur de la cellule. Une ligne et une colonne ferment l'image
+# au sud et à l'est.
+import struct
+import zlib
+
+from app.Maze import EAST, SOUTH
+
+# Valeurs des pixels avant conversion dans le format de sortie
+WALL = 0
+OPEN = 1
+PATH = 2
+
+# Niveaux de gris (PGM) des valeurs WALL, OPEN et PATH
+_GRAYS = bytes([0, 255, 170]) + bytes(253)
+# Mêmes niveaux sur 2 bits (0, 85, 170, 255), pour le PNG avec chemin
+_GRAYS_2 = bytes([0, 3, 2]) + bytes(253)
+
+# Pixel de mur ouvert (OPEN) ou fermé (WALL) selon les bits de la cellule
+_EAST_OPEN = bytes(OPEN if b & EAST else WALL for b in range(256))
+_SOUTH_OPEN = bytes(OPEN if b & SOUTH else WALL for b in range(256))
+# Bit à 1 pour un pixel ouvert (PNG noir et blanc) ou pour un mur (PBM)
+_WHITE = bytes([0, 1]) + bytes(254)
+_BLACK = bytes([1, 0]) + bytes(254)
+
+# Taille des blocs de données compressées écrits dans un bloc IDAT du PNG
+_IDAT_SIZE = 1 << 16
+# Les images de labyrinthe sont très répétitives : le niveau 1 de zlib les compresse
+# presque aussi bien que le niveau par défaut, une dizaine de fois plus vite
+_LEVEL = 1
+
+
+def _pack(line: bytes, table: bytes, depth: int) -> bytes:
+    """
+    Traduit une ligne de pixels par table puis la compacte sur depth bits par pixel (1 ou 2),
+    le premier pixel dans les bits de poids fort. Même principe que MazeFile.pack :
+    des entiers décalés qui ne débordent jamais d'un octet sur le suivant.
+    """
+    per_byte = 8 // depth
+    line = line.translate(table)
+    line += bytes(-len(line) % per_byte)
+    size = len(line) // per_byte
+    packed = 0
+    for p in range(per_byte):
+        packed |= int.from_bytes(line[p::per_byte], "big") << (8 - depth*(p+1))
+    return packed.to_bytes(size, "big")
+
+
+def _path_rows(path, cell_px: int) -> tuple:
+    """
+    Regroupe les pixels du chemin par ligne de cellules : (intérieurs {ligne: [colonnes de pixels
+    de début]}, passages vers le haut {ligne: [colonnes de début]}). Le passage entre deux cellules
+    voisines du chemin est colorié comme le chemin, pour que le tracé soit continu.
+    """
+    inner = {}
+    upward = {}
+    previous = None
+    for i, j in path:
+        inner.setdefault(i, []).append(j*cell_px + 1)
+        if previous is not None:
+            pi, pj = previous
+            if pi == i and abs(pj - j) == 1:
+                # Pixel du mur ouest de la cellule la plus à droite
+                inner[i].append(max(pj, j)*cell_px)
+            elif pj == j and abs(pi - i) == 1:
+                upward.setdefault(max(pi, i), []).append(j*cell_px + 1)
+        previous = (i, j)
+    return inner, upward
+
+
+def scanlines(maze, cell_px: int = 4, path=None):
+    """
+    Produit les lignes de pixels de l'image du labyrinthe, une à une, sous forme d'octets
+    WALL, OPEN ou PATH. path (facultatif) est une suite de cellules (l,c), par exemple
+    le résultat de solve_bfs, tracée avec la valeur PATH.
+    """
+    assert cell_px >= 2, "Erreur : une cellule occupe au moins 2 pixels de côté"
+    height, width = maze.height, maze.width
+    cells = maze._cells
+    size = width*cell_px + 1
+    inner, upward = _path_rows(path or (), cell_px)
+    span = bytes([PATH]) * (cell_px - 1)
+
+    border = bytes(size)
+    above = None
+    for i in range(height):
+        row = bytes(cells[i*width:(i+1)*width])
+        if above is None:
+            yield border
+        else:
+            # Murs au sud de la ligne précédente, coins toujours fermés
+            line = bytearray(size)
+            for t in range(1, cell_px):
+                line[t:width*cell_px:cell_px] = above.translate(_SOUTH_OPEN)
+            for x in upward.get(i, ()):
+                line[x:x + cell_px - 1] = span
+            yield bytes(line)
+
+        # Intérieur des cellules, murs à l'ouest (bords gauche et droit fermés)
+        line = bytearray([OPEN]) * size
+        line[0] = line[-1] = WALL
+        line[cell_px:width*cell_px:cell_px] = row[:-1].translate(_EAST_OPEN)
+        for x in inner.get(i, ()):
+            if x % cell_px:
+                line[x:x + cell_px - 1] = span
+            else:
+                line[x] = PATH
+        line = bytes(line)
+        for _ in range(cell_px - 1):
+            yield line
+        above = row
+    yield border
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    """
+    Bloc PNG : longueur, type, données et CRC du type et des données
+    """
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+
+
+def write(maze, dest: str, cell_px: int = 4, path=None) -> None:
+    """
+    Écrit l'image du labyrinthe dans le fichier dest, dont l'extension donne le format :
+    .pbm (noir et blanc), .pgm (niveaux de gris) ou .png (noir et blanc, ou 4 niveaux de gris
+    si un chemin est tracé). Le PNG est compressé au fil des lignes avec zlib.
+    """
+    extension = dest.rsplit(".", 1)[-1].lower()
+    if extension not in ("pbm", "pgm", "png"):
+        raise ValueError(f"Format d'image inconnu {extension!r} (pbm, pgm ou png)")
+    path = list(path) if path is not None else None
+    if path and extension == "pbm":
+        raise ValueError("Le format PBM (noir et blanc) ne peut pas tracer de chemin : utiliser pgm ou png")
+
+    size = (maze.width*cell_px + 1, maze.height*cell_px + 1)
+    lines = scanlines(maze, cell_px, path)
+    with open(dest, "wb") as fileobj:
+        if extension == "pbm":
+            fileobj.write(b"P4\n%d %d\n" % size)
+            for line in lines:
+                fileobj.write(_pack(line, _BLACK, 1))
+        elif extension == "pgm":
+            fileobj.write(b"P5\n%d %d\n255\n" % size)
+            for line in lines:
+                fileobj.write(line.translate(_GRAYS))
+        else:
+            # Noir et blanc sur 1 bit sans chemin, niveaux de gris sur 2 bits sinon
+            depth, table = (2, _GRAYS_2) if path else (1, _WHITE)
+            fileobj.write(b"\x89PNG\r\n\x1a\n")
+            fileobj.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], depth, 0, 0, 0, 0)))
+            compressor = zlib.compressobj(_LEVEL)
+            pending = []
+            pending_size = 0
+            for line in lines:
+                # Octet de filtre 0 (aucun) en tête de chaque ligne
+                data = compressor.compress(b"\0" + _pack(line, table, depth))
+                if data:
+                    pending.append(data)
+                    pending_size += len(data)
+                    if pending_size >= _IDAT_SIZE:
+                        fileobj.write(_chunk(b"IDAT", b"".join(pending)))
+                        pending, pending_size = [], 0
+            pending.append(compressor.flush())
+            fileobj.write(_chunk(b"IDAT", b"".join(pending)))
+            fileobj.write(_chunk(b"IEND", b""))
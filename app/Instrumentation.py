@@ -0,0 +1,138 @@
+import cProfile
+import pstats
+from functools import wraps
+from time import perf_counter
+
+from app.SolveResult import SolveResult
+
+# Opérations élémentaires comptées en plus des algorithmes (gen_*, solve_*, distance_map)
+HOT = ("add_wall", "remove_wall", "get_walls", "get_contiguous_cells")
+
+
+class Instrumentation:
+    """
+    Classe Instrumentation
+    Compte les appels et le temps passé dans les opérations d'une classe de
+    labyrinthe, le temps de chaque algorithme (gen_*, solve_*, distance_map),
+    les opérations appelées depuis chacun d'eux et les cellules développées
+    par les solveurs. S'utilise comme gestionnaire de contexte : les méthodes
+    de la classe sont remplacées par des versions mesurées à l'entrée du bloc
+    et restaurées à sa sortie, si bien qu'en dehors du bloc la mesure ne coûte rien.
+    Seul le processus courant est mesuré (pas les processus de gen_tiled ou generate_batch).
+    """
+    active = None
+
+    def __init__(self, cls, callback=None, profile: bool = False):
+        """
+        Constructeur de l'instrumentation de la classe cls.
+        callback(nom, durée) est appelé après chaque appel mesuré ;
+        avec profile, un profil cProfile est enregistré pendant le bloc.
+        """
+        self.cls      = cls
+        self.callback = callback
+        self.profiler = cProfile.Profile() if profile else None
+        self.calls    = {}
+        self.seconds  = {}
+        # algorithme -> {opération: nombre d'appels faits pendant l'algorithme}
+        self.inside   = {}
+        self.expanded = 0
+        self._phases  = []
+        self._saved   = {}
+
+    def names(self) -> list:
+        """
+        Retourne les noms des méthodes mesurées
+        """
+        algorithms = sorted(name for name in dir(self.cls) if name.startswith(("gen_", "solve_")))
+        return list(HOT) + algorithms + ["distance_map"]
+
+    def _wrap(self, name: str, func):
+        """
+        Retourne la version mesurée de la fonction func, enregistrée sous le nom name
+        """
+        calls = self.calls
+        seconds = self.seconds
+        inside = self.inside
+        phases = self._phases
+        callback = self.callback
+        phase = name not in HOT
+        solver = name.startswith("solve_")
+        calls[name] = 0
+        seconds[name] = 0.0
+
+        @wraps(func)
+        def measured(*args, **kwargs):
+            if phases:
+                counts = inside.setdefault(phases[-1], {})
+                counts[name] = counts.get(name, 0) + 1
+            # Un solveur appelé par un autre (solve_dfs avec cache) ne compte pas ses cellules deux fois
+            outermost = solver and not any(p.startswith("solve_") for p in phases)
+            if phase:
+                # La phase apparaît dans inside même si elle n'appelle aucune opération mesurée
+                inside.setdefault(name, {})
+                phases.append(name)
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                if phase:
+                    phases.pop()
+                calls[name] += 1
+                seconds[name] += elapsed
+                if callback is not None:
+                    callback(name, elapsed)
+            if outermost and isinstance(result, SolveResult):
+                self.expanded += result.visited
+            return result
+        return measured
+
+    def __enter__(self):
+        assert Instrumentation.active is None, "Une instrumentation est déjà active"
+        Instrumentation.active = self
+        for name in self.names():
+            # La méthode peut être héritée : on la cherche sur la classe qui la définit,
+            # et la version mesurée est posée sur self.cls seulement
+            owner = next(klass for klass in self.cls.__mro__ if name in vars(klass))
+            raw = vars(owner)[name]
+            self._saved[name] = (raw, owner is self.cls)
+            if isinstance(raw, classmethod):
+                setattr(self.cls, name, classmethod(self._wrap(name, raw.__func__)))
+            else:
+                setattr(self.cls, name, self._wrap(name, raw))
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler is not None:
+            self.profiler.disable()
+        for name, (raw, own) in self._saved.items():
+            if own:
+                setattr(self.cls, name, raw)
+            else:
+                # Méthode héritée : on retire la version mesurée pour retrouver celle du parent
+                delattr(self.cls, name)
+        self._saved.clear()
+        Instrumentation.active = None
+        return False
+
+    def stats(self) -> dict:
+        """
+        Retourne une copie des mesures : pour chaque méthode appelée au moins une fois,
+        nombre d'appels et temps cumulé (en secondes, appels imbriqués inclus),
+        opérations appelées depuis chaque algorithme et cellules développées par les solveurs
+        """
+        return {
+            "operations": {name: {"calls": count, "seconds": self.seconds[name]}
+                           for name, count in self.calls.items() if count},
+            "inside": {name: dict(counts) for name, counts in self.inside.items()},
+            "expanded": self.expanded,
+        }
+
+    def print_profile(self, sort: str = "cumulative", limit: int = 20) -> None:
+        """
+        Affiche les limit premières lignes du profil cProfile, triées selon sort
+        """
+        assert self.profiler is not None, "Le profil n'a pas été demandé (profile=True)"
+        pstats.Stats(self.profiler).sort_stats(sort).print_stats(limit)
@@ -0,0 +1,296 @@
+from array import array
+from heapq import heappop, heappush
+
+from app.Maze import EAST, SOUTH
+from app.SolveResult import SolveResult
+
+# Nombre de passages portés par une cellule (est et sud), et présence de chacun
+_OWN = bytes((b & EAST != 0) + (b & SOUTH != 0) for b in range(256))
+_HAS_EAST = bytes(b & EAST != 0 for b in range(256))
+_HAS_SOUTH = bytes(b & SOUTH != 0 for b in range(256))
+
+
+def _degrees(maze) -> bytes:
+    """
+    Retourne le nombre de passages ouverts de chaque cellule, indexé par cell_id.
+    Les quatre contributions (est, sud, ouest, nord) tiennent chacune sur un octet
+    par cellule et valent au plus 1 : on les additionne comme de grands entiers,
+    sans retenue d'un octet à l'autre.
+    """
+    n = maze.height*maze.width
+    width = maze.width
+    cells = bytes(maze._cells[:]) if n else b""
+    # Le passage est de la cellule k-1 (inexistant en fin de ligne) ouvre k vers l'ouest
+    west = b"\0" + cells[:-1].translate(_HAS_EAST) if n else b""
+    north = bytes(width) + cells[:n-width].translate(_HAS_SOUTH) if n else b""
+    total = sum(int.from_bytes(part, "little") for part in (cells.translate(_OWN), west[:n], north[:n]))
+    return total.to_bytes(n, "little")
+
+
+def _next(cells, width: int, prev: int, cur: int) -> int:
+    """
+    Cellule suivante dans un couloir : le passage ouvert de cur (qui en a exactement deux)
+    qui ne ramène pas à prev
+    """
+    bits = cells[cur]
+    if bits & EAST and cur+1 != prev:
+        return cur+1
+    if bits & SOUTH and cur+width != prev:
+        return cur+width
+    if cur % width and cells[cur-1] & EAST and cur-1 != prev:
+        return cur-1
+    return cur-width
+
+
+class JunctionGraph:
+    """
+    Classe Graphe des carrefours
+    Graphe d'un labyrinthe dont les couloirs (suites de cellules ayant exactement
+    deux passages ouverts) sont contractés en arêtes pondérées par leur longueur.
+    Les noeuds sont les carrefours, les culs-de-sac et les cellules isolées ;
+    une boucle faite uniquement de couloir reçoit un noeud choisi arbitrairement.
+    Chaque cellule de couloir connaît son arête (owner) et sa distance à la
+    première extrémité de celle-ci (offset), ce qui permet de partir ou d'arriver
+    au milieu d'un couloir. Construction en O(cellules) ; une requête ne développe
+    que des noeuds et les chemins ne sont redéroulés en cellules qu'à la demande.
+    L'index décrit les murs au moment de sa construction : il est périmé dès
+    que le labyrinthe est modifié.
+    """
+    def __init__(self, maze):
+        """
+        Constructeur du graphe contracté du labyrinthe maze
+        """
+        n = maze.height*maze.width
+        self.maze    = maze
+        self.width   = maze.width
+        self.version = maze._version
+        # Extrémités, longueur (en pas) et première cellule après a de chaque arête
+        self.edge_a      = array('l')
+        self.edge_b      = array('l')
+        self.edge_length = array('l')
+        self.edge_first  = array('l')
+        # Arête et distance à son extrémité a de chaque cellule de couloir (-1 pour les noeuds)
+        self.owner   = array('l', [-1]) * n
+        self.offset  = array('l', [0]) * n
+        # noeud -> liste de (voisin, longueur, arête)
+        self.adjacency = {}
+
+        open_moves = maze._open_moves
+        offsets = maze.index.offsets
+        degrees = _degrees(maze)
+
+        for k in range(n):
+            if degrees[k] != 2:
+                self._add_node(k, degrees, open_moves, offsets)
+        # Les boucles sans carrefour n'ont été atteintes par aucune arête
+        for k in range(n):
+            if degrees[k] == 2 and self.owner[k] < 0 and k not in self.adjacency:
+                self._add_node(k, degrees, open_moves, offsets)
+        self.corridors = n - self.owner.count(-1)
+
+    def _add_node(self, node: int, degrees: bytes, open_moves, offsets) -> None:
+        """
+        Déclare node comme noeud et suit chacun de ses couloirs jusqu'au noeud suivant.
+        Une arête n'est enregistrée que depuis l'une de ses extrémités (la plus petite,
+        ou pour une boucle, dans le sens de sa plus petite première cellule).
+        """
+        adjacency = self.adjacency.setdefault(node, [])
+        owner = self.owner
+        cells = self.maze._cells
+        width = self.width
+        for d in open_moves(node):
+            prev, cur = node, node + offsets[d]
+            corridor = []
+            while degrees[cur] == 2 and cur != node:
+                corridor.append(cur)
+                prev, cur = cur, _next(cells, width, prev, cur)
+            if node > cur or (node == cur and corridor and corridor[0] > corridor[-1]):
+                continue
+            e = len(self.edge_a)
+            length = len(corridor) + 1
+            self.edge_a.append(node)
+            self.edge_b.append(cur)
+            self.edge_length.append(length)
+            self.edge_first.append(corridor[0] if corridor else cur)
+            for p, c in enumerate(corridor, 1):
+                owner[c] = e
+                self.offset[c] = p
+            adjacency.append((cur, length, e))
+            if cur != node:
+                self.adjacency.setdefault(cur, []).append((node, length, e))
+
+    def stats(self) -> dict:
+        """
+        Retourne la taille du graphe et la proportion de cellules de couloir,
+        qui est aussi la part de développements évitée par rapport au parcours des cellules
+        """
+        n = len(self.owner)
+        return {
+            "cells": n,
+            "nodes": len(self.adjacency),
+            "edges": len(self.edge_a),
+            "corridor_cells": self.corridors,
+            "corridor_ratio": self.corridors / n if n else 0.0,
+        }
+
+    def edge_cells(self, e: int) -> list:
+        """
+        Retourne les cell_id de l'arête e, de son extrémité a à son extrémité b
+        """
+        a, b = self.edge_a[e], self.edge_b[e]
+        cells = [a]
+        prev, cur = a, self.edge_first[e]
+        for _ in range(self.edge_length[e] - 1):
+            cells.append(cur)
+            prev, cur = cur, _next(self.maze._cells, self.width, prev, cur)
+        cells.append(b)
+        return cells
+
+    def _anchors(self, k: int) -> list:
+        """
+        Points d'entrée du graphe pour la cellule k : [(noeud, distance, arête, position du noeud
+        sur l'arête)], l'arête valant -1 si k est elle-même un noeud. Sur une boucle
+        (extrémités confondues), seul le plus court des deux sens est retenu.
+        """
+        e = self.owner[k]
+        if e < 0:
+            return [(k, 0, -1, 0)]
+        p = self.offset[k]
+        length = self.edge_length[e]
+        if self.edge_a[e] == self.edge_b[e]:
+            return [(self.edge_a[e], p, e, 0) if 2*p <= length else (self.edge_a[e], length - p, e, length)]
+        return [(self.edge_a[e], p, e, 0), (self.edge_b[e], length - p, e, length)]
+
+    def _search(self, first: int, goal: int, heuristic: bool) -> tuple:
+        """
+        Dijkstra (ou A* avec la distance de Manhattan, qui ne surestime jamais un couloir)
+        entre les cellules first et goal. Retourne (longueur ou None, prédécesseurs des noeuds
+        (noeud précédent ou -1 pour le départ, arête, position du noeud sur l'arête de départ),
+        sortie (noeud, arête, position) ou None pour un trajet direct, nombre de noeuds développés).
+        """
+        assert self.maze._version == self.version, "Le labyrinthe a été modifié depuis la construction du graphe"
+        width = self.width
+        gi, gj = divmod(goal, width)
+        adjacency = self.adjacency
+
+        def estimate(node: int) -> int:
+            if not heuristic:
+                return 0
+            i, j = divmod(node, width)
+            return abs(i - gi) + abs(j - gj)
+
+        # Arrivée : noeud du graphe -> (distance restante jusqu'à goal, arête, position du noeud)
+        exits = {node: (dist, e, pos) for node, dist, e, pos in self._anchors(goal)}
+        best, last = float("inf"), None
+        # Départ et arrivée sur le même couloir : trajet direct sans passer par un noeud
+        if self.owner[first] >= 0 and self.owner[first] == self.owner[goal]:
+            best = abs(self.offset[first] - self.offset[goal])
+        elif first == goal:
+            best = 0
+
+        costs = {}
+        predecessors = {}
+        heap = []
+        for node, dist, e, pos in self._anchors(first):
+            if dist < costs.get(node, dist+1):
+                costs[node] = dist
+                predecessors[node] = (-1, e, pos)
+                heappush(heap, (dist + estimate(node), dist, node))
+
+        # L'heuristique étant cohérente, un noeud sorti du tas avec son coût définitif
+        # n'est plus jamais amélioré : les entrées périmées sont simplement ignorées
+        expanded = 0
+        while heap:
+            f, g, node = heappop(heap)
+            if f >= best:
+                break
+            if g > costs[node]:
+                continue
+            expanded += 1
+            if node in exits and g + exits[node][0] < best:
+                best, last = g + exits[node][0], (node,) + exits[node][1:]
+            for nxt, length, e in adjacency[node]:
+                cost = g + length
+                if cost < costs.get(nxt, cost+1):
+                    costs[nxt] = cost
+                    predecessors[nxt] = (node, e, -1)
+                    if heuristic:
+                        i, j = divmod(nxt, width)
+                        heappush(heap, (cost + abs(i - gi) + abs(j - gj), cost, nxt))
+                    else:
+                        heappush(heap, (cost, cost, nxt))
+        if best == float("inf"):
+            return None, predecessors, None, expanded
+        return best, predecessors, last, expanded
+
+    def _segment(self, e: int, p: int, q: int) -> list:
+        """
+        Cellules de l'arête e de la position p à la position q incluses (position 0 : extrémité a,
+        position edge_length[e] : extrémité b)
+        """
+        cells = self.edge_cells(e)
+        return cells[p:q+1] if p <= q else cells[q:p+1][::-1]
+
+    def distance(self, start: tuple, end: tuple):
+        """
+        Retourne la longueur (en pas) du plus court chemin de start à end, ou None,
+        sans redérouler le chemin en cellules
+        """
+        width = self.width
+        return self._search(start[0]*width + start[1], end[0]*width + end[1], False)[0]
+
+    def solve_dijkstra(self, start: tuple, end: tuple) -> SolveResult:
+        """
+        Plus court chemin de start à end par Dijkstra sur le graphe contracté ;
+        visited compte les noeuds développés
+        """
+        return self._solve(start, end, False)
+
+    def solve_astar(self, start: tuple, end: tuple) -> SolveResult:
+        """
+        Plus court chemin de start à end par A* (distance de Manhattan) sur le graphe contracté
+        """
+        return self._solve(start, end, True)
+
+    def _solve(self, start: tuple, end: tuple, heuristic: bool) -> SolveResult:
+        """
+        Recherche sur le graphe puis déroulement du chemin en cellules
+        """
+        width = self.width
+        first = start[0]*width + start[1]
+        goal = end[0]*width + end[1]
+        best, predecessors, last, expanded = self._search(first, goal, heuristic)
+        result = SolveResult(None, expanded, {}, width)
+        if best is None:
+            return result
+
+        if last is None:
+            # Trajet direct, sur un même couloir ou sans bouger
+            e = self.owner[first]
+            cells = [first] if first == goal else self._segment(e, self.offset[first], self.offset[goal])
+        else:
+            # Segments du dernier au premier : noeud de sortie -> arrivée, puis arêtes remontées
+            node, e, pos = last
+            segments = [[goal] if e < 0 else self._segment(e, pos, self.offset[goal])]
+            while True:
+                prev, e, pos = predecessors[node]
+                if prev < 0:
+                    segments.append([first] if e < 0 else self._segment(e, self.offset[first], pos))
+                    break
+                length = self.edge_length[e]
+                if self.edge_a[e] == prev:
+                    segments.append(self._segment(e, 0, length))
+                else:
+                    segments.append(self._segment(e, length, 0))
+                node = prev
+            segments.reverse()
+            cells = segments[0]
+            for segment in segments[1:]:
+                cells += segment[1:]
+
+        preds = result.predecessors
+        preds[first] = first
+        for a, b in zip(cells, cells[1:]):
+            preds[b] = a
+        result.path = [divmod(k, width) for k in cells]
+        return result
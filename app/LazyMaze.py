@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from random import Random
+
+from app import Generators
+from app.Maze import EAST, SOUTH, Maze
+
+# Masque des entiers sur 64 bits
+_MASK64 = (1 << 64) - 1
+
+# Familles dont chaque ligne se tire indépendamment des autres
+ROWS = {
+    "btree": Generators.btree_row,
+    "sidewinder": Generators.sidewinder_row,
+}
+
+
+def _mix(x: int) -> int:
+    """
+    Mélange splitmix64 : entier sur 64 bits dont chaque bit dépend de tous ceux de x
+    """
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class LazyCells:
+    """
+    Classe Cellules procédurales
+    S'utilise à la place du tableau d'octets Maze._cells : chaque ligne est tirée
+    à la demande avec un générateur initialisé par un hachage de (graine, numéro de ligne),
+    si bien qu'une même cellule a toujours les mêmes murs. Les lignes décodées
+    récemment sont gardées dans un petit cache LRU. La mémoire ne dépend
+    que de la largeur et de la taille du cache, jamais de la hauteur.
+    """
+    __slots__ = ("height", "width", "seed", "row_of", "rows", "capacity")
+
+    def __init__(self, height: int, width: int, algorithm: str, seed: int, capacity: int):
+        """
+        Constructeur des cellules d'un labyrinthe procédural de la famille algorithm
+        """
+        assert algorithm in ROWS, f"Erreur : famille procédurale inconnue {algorithm!r} (parmi {', '.join(ROWS)})"
+        self.height   = height
+        self.width    = width
+        self.seed     = _mix(seed & _MASK64)
+        self.row_of   = ROWS[algorithm]
+        self.rows     = OrderedDict()
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.height*self.width
+
+    def row(self, i: int) -> bytes:
+        """
+        Retourne les octets de la ligne i (bits EAST et SOUTH), depuis le cache si possible
+        """
+        rows = self.rows
+        row = rows.get(i)
+        if row is not None:
+            rows.move_to_end(i)
+            return row
+        width = self.width
+        if i == self.height-1:
+            # Dernière ligne : tous les murs à l'est sont cassés
+            row = bytes([EAST]) * (width-1) + bytes(1)
+        else:
+            row = bytes(self.row_of(width, Random(_mix(self.seed ^ i))))
+        rows[i] = row
+        if len(rows) > self.capacity:
+            rows.popitem(last=False)
+        return row
+
+    def __getitem__(self, k):
+        width = self.width
+        if isinstance(k, slice):
+            start, stop, step = k.indices(len(self))
+            if step == 1 and start < stop and start // width == (stop-1) // width:
+                i = start // width
+                return self.row(i)[start - i*width:stop - i*width]
+            return bytes(self[j] for j in range(start, stop, step))
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("indice de cellule hors du labyrinthe")
+        i, j = divmod(k, width)
+        return self.row(i)[j]
+
+    def __setitem__(self, k: int, bits: int) -> None:
+        raise TypeError("labyrinthe procédural en lecture seule")
+
+    def __iter__(self):
+        for i in range(self.height):
+            yield from self.row(i)
+
+    def count(self, bits: int) -> int:
+        """
+        Nombre de cellules valant exactement bits (parcourt toutes les lignes)
+        """
+        return sum(self.row(i).count(bits) for i in range(self.height))
+
+
+class LazyMaze(Maze):
+    """
+    Classe Labyrinthe procédural
+    Labyrinthe des familles arbre binaire et sidewinder, dont les murs ne sont jamais
+    stockés mais tirés ligne par ligne à la demande (voir LazyCells) : la grille peut
+    être gigantesque et la mémoire reste constante. Il s'utilise comme un Maze en
+    lecture seule : neighbors, get_contiguous_cells, solve_astar et solve_bidirectional
+    (qui ne mémorisent que les cellules atteintes), et region pour le rendu d'une zone.
+    Les solveurs qui allouent un tableau par cellule (solve_bfs, solve_dfs, distance_map)
+    et le rendu complet restent disponibles mais coûtent O(cellules).
+    Les constructeurs hérités de Maze (gen_*, load, from_text...) lèvent TypeError.
+    """
+    def __init__(self, height: int, width: int, algorithm: str = "btree", seed: int = 0, cache_rows: int = 64):
+        """
+        Constructeur d'un labyrinthe procédural de height x width cellules de la famille
+        algorithm ("btree" ou "sidewinder"), entièrement déterminé par seed.
+        cache_rows est le nombre de lignes décodées gardées en mémoire.
+        """
+        super().__init__(0, 0)
+        self.height    = height
+        self.width     = width
+        self.algorithm = algorithm
+        self.seed      = seed
+        self._cells    = LazyCells(height, width, algorithm, seed, cache_rows)
+
+    def fill(self) -> None:
+        raise TypeError("labyrinthe procédural en lecture seule")
+
+    def empty(self) -> None:
+        raise TypeError("labyrinthe procédural en lecture seule")
+
+    def region(self, top: int, left: int, height: int, width: int) -> Maze:
+        """
+        Retourne la zone de height x width cellules dont le coin haut gauche est (top, left),
+        copiée dans un Maze ordinaire (les passages qui sortent de la zone deviennent
+        des murs) : on peut alors l'afficher avec overlay ou str
+        """
+        assert 0 <= top and top + height <= self.height and 0 <= left and left + width <= self.width, \
+            f"Erreur : la zone ({top}, {left}) de {height} x {width} sort du labyrinthe"
+        cells = bytearray()
+        for i in range(top, top + height):
+            cells += self._cells.row(i)[left:left + width]
+        if height and width:
+            # Bords de la zone : pas de passage vers l'extérieur
+            for k in range(width-1, height*width, width):
+                cells[k] &= ~EAST
+            for k in range((height-1)*width, height*width):
+                cells[k] &= ~SOUTH
+        return Maze._from_cells(height, width, cells)
+
+
+def _refuse(name: str) -> classmethod:
+    """
+    Retourne un constructeur de remplacement qui refuse de construire un LazyMaze
+    """
+    def constructor(cls, *args, **kwargs):
+        raise TypeError(f"Erreur : {cls.__name__}.{name} n'existe pas pour un labyrinthe procédural, "
+                        f"qui se construit avec {cls.__name__}(hauteur, largeur, famille, graine) ; "
+                        f"utiliser Maze.{name}")
+    constructor.__name__ = name
+    constructor.__qualname__ = f"LazyMaze.{name}"
+    return classmethod(constructor)
+
+
+# Les constructeurs hérités de Maze (gen_*, load, from_text...) écriraient dans des cellules
+# en lecture seule ou produiraient un LazyMaze dont les cellules ne sont pas procédurales :
+# ils sont tous remplacés par une erreur. instrument et stream_eller ne construisent pas de labyrinthe.
+for _name, _value in list(vars(Maze).items()):
+    if isinstance(_value, classmethod) and _name not in ("instrument", "stream_eller"):
+        setattr(LazyMaze, _name, _refuse(_name))
+del _name, _value
@@ -1,11 +1,119 @@
-from random import choice, randint, shuffle
+import mmap
+import random
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from random import Random, choice, randint
+
+from app import MazeFile
+from app.GridIndex import LEFT, MOVES, RIGHT, UP, GridIndex
+from app.Instrumentation import Instrumentation
+from app.SolveCache import SolveCache
+from app.SolveResult import SolveResult
+from app.TreeIndex import TreeIndex
+from app.UnionFind import UnionFind
+from app.WallIndex import WallIndex
+
+# Chaque cellule du labyrinthe est codée sur un octet dont les bits indiquent
+# les passages ouverts vers ses voisines de droite et du dessous. Les passages
+# vers le haut et la gauche se lisent sur la cellule voisine.
+EAST  = 1
+SOUTH = 2
+
+# Glyphes du rendu texte, indexés par les bits d'une cellule
+_EAST_SIDES        = (" ┃", "  ", " ┃", "  ")
+_EAST_GLYPHS       = {bits: "  " + _EAST_SIDES[bits] for bits in range(4)}
+_SOUTH_GLYPHS      = {bits: "   ╋" if bits & SOUTH else "━━━╋" for bits in range(4)}
+_SOUTH_LAST_GLYPHS = {0: "━━━┫", SOUTH: "   ┫"}
+
+
+def _render_rows(rows, width: int, by_row=None):
+    """
+    Produit le rendu texte ligne par ligne (sans retour à la ligne) à partir des octets
+    de chaque ligne de cellules, lus au fur et à mesure dans l'itérable rows.
+    by_row (facultatif) associe à un numéro de ligne le contenu {colonne: caractère}.
+    """
+    yield "┏" + "━━━┳"*(width-1) + "━━━┓"
+    above = None
+    for i, row in enumerate(rows):
+        if above is not None:
+            # Murs au sud de la ligne précédente
+            yield "┣" + above[:-1].decode("latin-1").translate(_SOUTH_GLYPHS) + _SOUTH_LAST_GLYPHS[above[-1] & SOUTH]
+        if by_row and i in by_row:
+            chars = by_row[i]
+            yield "┃" + "".join([" " + chars.get(j, " ") + _EAST_SIDES[bits & EAST] for j, bits in enumerate(row)])
+        else:
+            yield "┃" + row.decode("latin-1").translate(_EAST_GLYPHS)
+        above = row
+    yield "┗" + "━━━┻"*(width-1) + "━━━┛"
+
+
+class NeighborsView(Mapping):
+    """
+    Vue en lecture seule des voisinages d'un labyrinthe.
+    Se comporte comme l'ancien dictionnaire 'neighbors' :
+      - clés : cellules (l,c), dans l'ordre ligne par ligne
+      - valeurs : ensemble des cellules voisines accessibles, construit à la demande
+    """
+    __slots__ = ("_maze",)
+
+    def __init__(self, maze):
+        self._maze = maze
+
+    def __getitem__(self, cell: tuple) -> set:
+        maze = self._maze
+        try:
+            i, j = cell
+        except (TypeError, ValueError):
+            raise KeyError(cell) from None
+        if not (0 <= i < maze.height and 0 <= j < maze.width):
+            raise KeyError(cell)
+
+        width = maze.width
+        cells = maze._cells
+        k = i*width + j
+        bits = cells[k]
+        result = set()
+        if i > 0 and cells[k-width] & SOUTH:
+            result.add((i-1, j))
+        if bits & SOUTH:
+            result.add((i+1, j))
+        if j > 0 and cells[k-1] & EAST:
+            result.add((i, j-1))
+        if bits & EAST:
+            result.add((i, j+1))
+        return result
+
+    def __contains__(self, cell) -> bool:
+        try:
+            i, j = cell
+            return 0 <= i < self._maze.height and 0 <= j < self._maze.width
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        width = self._maze.width
+        for i in range(self._maze.height):
+            for j in range(width):
+                yield (i, j)
+
+    def __len__(self) -> int:
+        return self._maze.height * self._maze.width
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 
 class Maze:
     """
     Classe Labyrinthe
     Représentation sous forme de graphe non-orienté
-    dont chaque sommet est une cellule (un tuple (l,c))
-    et dont la structure est représentée par un dictionnaire
+    dont chaque sommet est une cellule (un tuple (l,c)).
+    La structure est stockée dans un tableau d'octets (un octet par cellule,
+    bits EAST et SOUTH pour les passages ouverts) et exposée par 'neighbors',
+    une vue qui se comporte comme un dictionnaire :
       - clés : sommets
       - valeurs : ensemble des sommets voisins accessibles
     """
@@ -15,10 +123,45 @@ class Maze:
         et de width cellules de large 
         Les voisinages sont initialisés à des ensembles vides
         Remarque : dans le labyrinthe créé, chaque cellule est complètement emmurée
+        (ou complètement ouverte sur ses voisines orthogonales si empty vaut True)
         """
         self.height    = height
         self.width     = width
-        self.neighbors = {(i,j): set() for i in range(height) for j in range (width)} if not empty else {(i,j): {(y, x) for y in range(i-1, i+2) for x in range(j-1, j+2) if (i, j) != (y, x) and 0 <= y <= height-1 and 0 <= x <= width-1} for i in range(height) for j in range(width)}
+        self._cells    = bytearray(height*width)
+        # Compteur de modifications et cache de résolution (désactivé par défaut)
+        self._version  = 0
+        self._cache    = None
+        # Index des murs présents, construit à la première utilisation
+        self._walls    = None
+        # Dernier graphe des carrefours construit (voir junction_graph)
+        self._junctions = None
+        if empty:
+            self.empty()
+
+    @classmethod
+    def _from_cells(cls, height: int, width: int, cells):
+        """
+        Construit un labyrinthe à partir d'un stockage de cellules déjà rempli
+        """
+        laby = cls(0, 0)
+        laby.height = height
+        laby.width  = width
+        laby._cells = cells
+        return laby
+
+    @property
+    def neighbors(self) -> NeighborsView:
+        """
+        Vue des voisinages accessibles de chaque cellule
+        """
+        return NeighborsView(self)
+
+    @property
+    def index(self) -> GridIndex:
+        """
+        Tables d'adjacence (partagées) de la forme du labyrinthe
+        """
+        return GridIndex.of(self.height, self.width)
  
     def info(self):
         """
@@ -43,6 +186,17 @@ class Maze:
         txt += "- Structure cohérente\n" if valid else f"- Structure incohérente : {c1} X {c2}\n"
         return txt
 
+    def _passage(self, c1: tuple, c2: tuple):
+        """
+        Retourne le couple (indice de cellule, bit) qui code le passage entre c1 et c2,
+        ou None si les deux cellules ne sont pas contiguës.
+        """
+        if c1[0] == c2[0] and abs(c1[1] - c2[1]) == 1:
+            return c1[0]*self.width + min(c1[1], c2[1]), EAST
+        if c1[1] == c2[1] and abs(c1[0] - c2[0]) == 1:
+            return min(c1[0], c2[0])*self.width + c1[1], SOUTH
+        return None
+
     def add_wall(self, c1: tuple, c2: tuple) -> None:
         """
         Ajoute un mur au labyrinthe entre la cellule c1 et la cellule c2.
@@ -57,11 +211,15 @@ class Maze:
             0 <= c2[0] < self.height and \
             0 <= c2[1] < self.width, \
             f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : les coordonnées ne sont pas compatibles avec les dimensions du labyrinthe"
-        # Ajout du mur
-        if c2 in self.neighbors[c1]:      # Si c2 est dans les voisines de c1
-            self.neighbors[c1].remove(c2) # on le retire
-        if c1 in self.neighbors[c2]:      # Si c3 est dans les voisines de c2
-            self.neighbors[c2].remove(c1) # on le retire
+        passage = self._passage(c1, c2)
+        if passage is None:
+            # Deux cellules non contiguës ne partagent aucun mur
+            return
+        # Ajout du mur : on éteint le bit du passage
+        k, bit = passage
+        if self._cells[k] & bit:
+            self._cells[k] &= ~bit
+            self._changed(True, k, bit)
 
     def remove_wall(self, c1: tuple, c2: tuple) -> None:
         """
@@ -72,38 +230,180 @@ class Maze:
             0 <= c2[0] < self.height and \
             0 <= c2[1] < self.width, \
             f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : les cordonnées ne sont pas comptabibles avec les dimensions du labyrinthe"
-        
-        if c2 not in self.neighbors[c1]:
-            self.neighbors[c1].add(c2)
-        if c1 not in self.neighbors[c2]:
-            self.neighbors[c2].add(c1)
+        passage = self._passage(c1, c2)
+        assert passage is not None, \
+            f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : les cellules ne sont pas contiguës"
+
+        k, bit = passage
+        if not self._cells[k] & bit:
+            self._cells[k] |= bit
+            self._changed(False, k, bit)
+
+    def _changed(self, added: bool, k: int, bit: int) -> None:
+        """
+        Signale la modification du passage bit de la cellule d'indice k :
+        la version du labyrinthe augmente et le cache de résolution en est informé.
+        """
+        self._version += 1
+        if self._cache is not None:
+            self._cache.record(self._version, added, k, k+1 if bit == EAST else k+self.width)
+        if self._walls is not None:
+            code = 2*k if bit == EAST else 2*k+1
+            if added:
+                self._walls.add(code)
+            else:
+                self._walls.discard(code)
 
     def get_walls(self) -> list:
         """
         Permet de récupérer tous les murs du tableau.
         Le retour se présente sous la forme d'une liste contenant la liste de deux cellules.
         """
+        width = self.width
         walls = []
+        for w in self._wall_codes():
+            i, j = divmod(w >> 1, width)
+            walls.append([(i, j), (i+1, j) if w & 1 else (i, j+1)])
+        return walls 
 
-        for c1 in self.neighbors.keys():
-            if (c1[0], c1[1]+1) in self.neighbors.keys() and (c1[0], c1[1]+1) not in self.neighbors[c1]:
-                walls.append([c1, (c1[0], c1[1]+1)])
-            if (c1[0]+1, c1[1]) in self.neighbors.keys() and (c1[0]+1, c1[1]) not in self.neighbors[c1]:
-                walls.append([c1, (c1[0]+1, c1[1])])
+    def _wall_of(self, code: int) -> list:
+        """
+        Retourne le mur [c1, c2] correspondant au code 2*k (est) ou 2*k+1 (sud)
+        """
+        i, j = divmod(code >> 1, self.width)
+        return [(i, j), (i+1, j) if code & 1 else (i, j+1)]
 
-        return walls 
+    def _wall_index(self) -> WallIndex:
+        """
+        Retourne l'index des murs présents, construit au premier appel puis
+        tenu à jour par add_wall et remove_wall (fill et empty le périment)
+        """
+        if self._walls is None:
+            self._walls = WallIndex(self.height*self.width, self._wall_codes())
+        return self._walls
+
+    def has_wall(self, c1: tuple, c2: tuple) -> bool:
+        """
+        Indique en O(1) si un mur sépare les cellules contiguës c1 et c2
+        (False pour deux cellules non contiguës, qui ne partagent aucun mur)
+        """
+        assert 0 <= c1[0] < self.height and \
+            0 <= c1[1] < self.width and \
+            0 <= c2[0] < self.height and \
+            0 <= c2[1] < self.width, \
+            f"Erreur lors du test d'un mur entre {c1} et {c2} : les coordonnées ne sont pas compatibles avec les dimensions du labyrinthe"
+        passage = self._passage(c1, c2)
+        if passage is None:
+            return False
+        k, bit = passage
+        return not self._cells[k] & bit
+
+    def wall_count(self) -> int:
+        """
+        Retourne le nombre de murs intérieurs présents, en O(1) une fois l'index des murs construit
+        """
+        return len(self._wall_index())
+
+    def random_wall(self, rng=None) -> list:
+        """
+        Retourne un mur [c1, c2] tiré uniformément parmi les murs présents, en O(1),
+        avec le générateur rng (module random par défaut)
+        """
+        return self._wall_of(self._wall_index().sample(rng or random))
+
+    def iter_walls(self):
+        """
+        Parcourt les murs présents, sous la même forme que get_walls mais sans construire
+        la liste et dans l'ordre de l'index des murs. Comme pour un dictionnaire,
+        modifier les murs pendant le parcours lève une RuntimeError.
+        """
+        version = self._version
+        for code in self._wall_index().codes:
+            if self._version != version:
+                raise RuntimeError("Les murs du labyrinthe ont été modifiés pendant leur parcours")
+            yield self._wall_of(code)
     
     def fill(self) -> None:
         """
         Permet d'ajouter tous les murs possible au labyrinthe.
         """
-        self.neighbors = {(i, j): set() for i in range(self.width) for j in range(self.height)}
+        self._rewrite(bytes(self.width), bytes(self.width))
 
     def empty(self) -> None:
         """
         Supprime tous les murs du labyrinthe.
         """
-        {(i,j): {(y, x) for y in range(i-1, i+2) for x in range(j-1, j+2) if (i, j) != (y, x) and 0 <= y <= self.height-1 and 0 <= x <= self.width-1} for i in range(self.height) for j in range(self.width)}
+        # Toutes les lignes sauf la dernière sont ouvertes à l'est et au sud,
+        # la dernière colonne n'a pas de voisine à l'est
+        row = bytes([EAST | SOUTH]) * (self.width-1) + bytes([SOUTH]) if self.width else b""
+        last = bytes([EAST]) * (self.width-1) + bytes([0]) if self.width else b""
+        self._rewrite(row, last)
+
+    def _rewrite(self, row: bytes, last: bytes) -> None:
+        """
+        Remplace toutes les lignes de cellules par row, et la dernière par last.
+        Un labyrinthe projeté en écriture est réécrit dans son fichier, par blocs de lignes ;
+        projeté en lecture seule, il lève une TypeError comme add_wall.
+        """
+        height, width = self.height, self.width
+        cells = self._cells
+        if isinstance(cells, MazeFile.PackedCells):
+            if not cells.writable:
+                raise TypeError("labyrinthe ouvert en lecture seule")
+            self._reset()
+            if height and width:
+                step = max(1, MazeFile.CHUNK // width)
+                for i in range(0, height-1, step):
+                    cells.write(i*width, row * min(step, height-1-i))
+                cells.write((height-1)*width, last)
+            return
+        self._reset()
+        self._cells = bytearray(row * (height-1) + last) if height and width else bytearray()
+
+    def _reset(self) -> None:
+        """
+        Signale le remplacement complet des murs : les arbres en cache sont tous périmés
+        """
+        self._version += 1
+        self._walls = None
+        if self._cache is not None:
+            self._cache.clear()
+
+    def enable_cache(self, budget: int = 64*1024*1024) -> None:
+        """
+        Active le cache des arbres de parcours en largeur, limité à budget octets.
+        solve_bfs, solve_dfs, distance_map et solve_many réutilisent alors l'arbre
+        calculé depuis un même départ tant que les murs modifiés depuis ne changent pas ses distances.
+        """
+        self._cache = SolveCache(budget)
+
+    def disable_cache(self) -> None:
+        """
+        Désactive et vide le cache de résolution
+        """
+        self._cache = None
+
+    def cache_stats(self) -> dict:
+        """
+        Retourne les compteurs du cache de résolution (succès, échecs, revalidations, occupation),
+        ou None si le cache n'est pas activé
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    @classmethod
+    def instrument(cls, callback=None, profile: bool = False) -> Instrumentation:
+        """
+        Retourne un gestionnaire de contexte qui mesure, le temps du bloc, les appels et
+        le temps passé dans add_wall, remove_wall, get_walls, get_contiguous_cells,
+        dans chaque algorithme (gen_*, solve_*, distance_map) et les cellules développées.
+        Hors du bloc, les méthodes d'origine sont rétablies et la mesure ne coûte rien.
+            with Maze.instrument() as mesure:
+                Maze.gen_sidewinder(100, 100)
+            mesure.stats()["inside"]["gen_sidewinder"]
+        callback(nom, durée) est appelé après chaque appel mesuré ; profile=True enregistre
+        en plus un profil cProfile (mesure.print_profile()).
+        """
+        return Instrumentation(cls, callback, profile)
 
     def get_contiguous_cells(self, cell: tuple) -> list: 
         """
@@ -125,133 +425,347 @@ class Maze:
 
         return cells
 
+    def cell_id(self, cell: tuple) -> int:
+        """
+        Retourne l'indice de la cellule dans le stockage ligne par ligne du labyrinthe
+        """
+        return cell[0]*self.width + cell[1]
+
+    def cell_of(self, k: int) -> tuple:
+        """
+        Retourne la cellule (l,c) correspondant à l'indice k
+        """
+        return divmod(k, self.width)
+
+    def _wall_codes(self) -> list:
+        """
+        Retourne les murs intérieurs présents, dans le même ordre que get_walls(),
+        codés par un entier : 2*k pour le mur à l'est de la cellule k,
+        2*k+1 pour le mur au sud de la cellule k.
+        """
+        codes = []
+        cells = self._cells
+        width = self.width
+        last_row = self.height - 1
+
+        k = 0
+        for i in range(self.height):
+            for j in range(width):
+                bits = cells[k]
+                if j < width-1 and not bits & EAST:
+                    codes.append(2*k)
+                if i < last_row and not bits & SOUTH:
+                    codes.append(2*k+1)
+                k += 1
+
+        return codes
+
+    def connectivity(self) -> UnionFind:
+        """
+        Construit une structure Union-Find des composantes connexes du labyrinthe,
+        indexée par cell_id. Une fois construite, savoir si deux cellules sont reliées
+        coûte O(α(n)) :
+            uf = laby.connectivity()
+            uf.connected(laby.cell_id(c1), laby.cell_id(c2))
+        """
+        uf = UnionFind(self.height*self.width)
+        width = self.width
+        for k, bits in enumerate(self._cells):
+            if bits & EAST:
+                uf.union(k, k+1)
+            if bits & SOUTH:
+                uf.union(k, k+width)
+        return uf
+
+    def is_perfect(self) -> bool:
+        """
+        Indique, en un passage sur les cellules, si le labyrinthe est parfait :
+        cohérent, connexe et sans cycle (voir le module Validation)
+        """
+        from app import Validation
+
+        return Validation.is_perfect(self)
+
+    def validate(self) -> dict:
+        """
+        Rapport structuré de toutes les vérifications du module Validation
+        (cohérence, adjacence orthogonale, composantes, cycles, labyrinthe parfait)
+        """
+        from app import Validation
+
+        return Validation.validate(self)
+
+    def metrics(self, sample: int = None, pairs: int = 64, rng=None) -> dict:
+        """
+        Statistiques de forme du labyrinthe (culs-de-sac, carrefours, facteur de rivière,
+        diamètre, longueur moyenne des solutions, longueurs des couloirs) pour comparer
+        les générateurs ; sample active l'estimation des couloirs par tirage (voir le module Metrics)
+        """
+        from app import Metrics
+
+        return Metrics.metrics(self, sample, pairs, rng)
+
+    def save(self, path: str) -> None:
+        """
+        Enregistre le labyrinthe dans un fichier binaire compact :
+        un en-tête (hauteur, largeur) puis 2 bits par cellule pour ses murs est et sud.
+        """
+        cells = self._cells
+        n = self.height*self.width
+        with open(path, "wb") as fileobj:
+            MazeFile.write_header(fileobj, self.height, self.width)
+            for start in range(0, n, MazeFile.CHUNK):
+                fileobj.write(MazeFile.pack(cells[start:min(start + MazeFile.CHUNK, n)]))
+
+    @classmethod
+    def load(cls, path: str, mapped: bool = False, writable: bool = False):
+        """
+        Charge un labyrinthe enregistré par save.
+
+        Arguments:
+            - path (str): chemin du fichier
+            - mapped (bool): si True, le fichier est projeté en mémoire (mmap) au lieu d'être lu :
+              les murs sont décodés à la demande, ce qui permet d'interroger des labyrinthes
+              plus grands que la mémoire vive
+            - writable (bool): avec mapped, répercute add_wall et remove_wall directement dans le fichier
+        """
+        laby = cls(0, 0)
+        with open(path, "r+b" if mapped and writable else "rb") as fileobj:
+            if mapped:
+                data = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+                height, width = MazeFile.read_header(data)
+                # PackedCells annonce toujours height*width cellules : on vérifie la taille du fichier
+                assert len(data) >= MazeFile.HEADER.size + (height*width + 3)//4, \
+                    "Erreur lors de la lecture du labyrinthe : fichier tronqué"
+                laby._cells = MazeFile.PackedCells(data, MazeFile.HEADER.size, height*width, writable)
+            else:
+                height, width = MazeFile.read_header(fileobj.read(MazeFile.HEADER.size))
+                laby._cells = MazeFile.unpack(fileobj.read(), height*width)
+        assert len(laby._cells) == height*width, "Erreur lors de la lecture du labyrinthe : fichier tronqué"
+        laby.height = height
+        laby.width = width
+        return laby
+
     @classmethod
-    def gen_btree(cls, height: int, width: int):
+    def from_text(cls, txt: str):
+        """
+        Reconstruit un labyrinthe à partir de son rendu texte (__str__ ou overlay
+        avec un caractère par cellule).
+        """
+        lines = txt.rstrip("\n").split("\n")
+        height = (len(lines) - 1) // 2
+        width = (len(lines[0]) - 1) // 4
+        laby = cls(height, width)
+        cells = laby._cells
+
+        for i in range(height):
+            # Ligne des cellules : un mur est s'affiche '┃' en colonne 4*(j+1)
+            row = lines[2*i + 1]
+            # Ligne de séparation sous la ligne i : un passage s'affiche ' ' en colonne 4*j+1
+            below = lines[2*i + 2] if i < height-1 else ""
+            for j in range(width):
+                k = i*width + j
+                if j < width-1 and row[4*(j+1)] == " ":
+                    cells[k] |= EAST
+                if below and below[4*j + 1] == " ":
+                    cells[k] |= SOUTH
+        return laby
+
+    @classmethod
+    def _generate(cls, algorithm: str, height: int, width: int, seed=None, rng=None):
+        """
+        Génère un labyrinthe avec le noyau de Generators associé à algorithm,
+        tiré depuis rng ou, à défaut, depuis un random.Random initialisé par seed
+        """
+        from app import Generators
+
+        if rng is None:
+            rng = Random(seed)
+        return cls._from_cells(height, width, Generators.KERNELS[algorithm](GridIndex.of(height, width), rng))
+
+    @classmethod
+    def gen_btree(cls, height: int, width: int, seed=None, rng=None):
         """
         Génère un labyrinthe via l'algorithme de l'arbre binaire.
 
         Arguments:
             - height (int): représente la hauteur du labyrinthe
             - width (int): représente la largeur du labyrinthe
+            - seed (int): graine d'un générateur aléatoire dédié ; les tirages sont alors faits
+              en bloc (voir Generators) et le labyrinthe ne dépend que de (algorithme, hauteur, largeur, seed)
+            - rng (random.Random): générateur aléatoire à utiliser à la place de seed
+        Sans seed ni rng, les tirages viennent du module random, comme auparavant.
         """
+        if seed is not None or rng is not None:
+            return cls._generate("gen_btree", height, width, seed, rng)
+
         laby = cls(height, width)
+        cells = laby._cells
+        directions = ["SOUTH", "EAST"]
 
         # On parcoure toutes les cellules du labyrinthe
+        k = 0
         for i in range(height):
+            has_south = i < height-1
             for j in range(width):
+                has_east = j < width-1
                 # On tire au hasard une direction entre SOUTH et EAST
-                direction = choice(["SOUTH", "EAST"])
+                direction = choice(directions)
 
+                # Chaque cellule ne touche qu'à ses propres murs sud et est :
+                # ils sont donc encore présents quand on arrive sur elle
                 if direction == "SOUTH":
-                    # On regarde s'il y a un mur au sud de cette cellule
-                    if [(i,j), (i+1,j)] in laby.get_walls():
+                    if has_south:
                         # On supprime le mur au sud
-                        laby.remove_wall((i,j), (i+1,j))
-                    # Au contraire, on regarde s'il y a un mur à l'est de cette cellule
-                    elif [(i,j),(i,j+1)] in laby.get_walls():
-                        # On supprime le mur à l'est
-                        laby.remove_wall((i,j), (i,j+1))
+                        cells[k] |= SOUTH
+                    elif has_east:
+                        # Sur la dernière ligne, on supprime le mur à l'est
+                        cells[k] |= EAST
                 else:
-                    # On regarde s'il y a un mur à l'est de cette cellule
-                    if [(i,j), (i,j+1)] in laby.get_walls():
+                    if has_east:
                         # On supprime le mur à l'est
-                        laby.remove_wall((i,j),(i,j+1))
-                    # Au contraire, on regarde s'il y a un mur au sud de cette cellule
-                    elif [(i,j), (i+1,j)] in laby.get_walls():
-                        # On supprime le mur au sud
-                        laby.remove_wall((i,j),(i+1,j))
+                        cells[k] |= EAST
+                    elif has_south:
+                        # Sur la dernière colonne, on supprime le mur au sud
+                        cells[k] |= SOUTH
+                k += 1
                 
         return laby
 
     @classmethod
-    def gen_sidewinder(cls, height: int, width: int):
+    def gen_sidewinder(cls, height: int, width: int, seed=None, rng=None):
         """
         Permet de générer un labyrinthe avec l'algorithme sidewinder
+        Les arguments seed et rng sont décrits dans gen_btree.
         """
+        if seed is not None or rng is not None:
+            return cls._generate("gen_sidewinder", height, width, seed, rng)
+
         laby = cls(height, width)
+        cells = laby._cells
 
         for i in range(height-1):
-            # On initialise une variable sequence à une liste vide
-            sequence = []
+            row = i*width
+            # La séquence courante est l'intervalle [start, j] de la ligne
+            start = row
             for j in range(width-1):
-                # On ajoute la cellule à la sequence
-                sequence.append((i,j))
+                k = row + j
 
                 # On tire au hasard au pile ou face (PILE représente 0, FACE représente 1)
                 piece = randint(0,1)
 
                 # On vérifie si c'est face
                 if piece:
-                    # On choisie une cellule à casser parmi la séquence
-                    cell = choice(sequence)
-                    
-                    # On vérifie que le mur au sud est accessible
-                    if [cell, (cell[0]+1, cell[1])] in laby.get_walls():
-                        # On supprime le mur au sud de la cellule
-                        laby.remove_wall(cell, (cell[0]+1, cell[1]))
+                    # On choisie une cellule de la séquence dont on casse le mur au sud
+                    cells[choice(range(start, k+1))] |= SOUTH
 
                     # On réinitialise la sequence à vide
-                    sequence = []
+                    start = k+1
                 else:
-                    # On vérifie que le mur à l'est est accessible
-                    if [(i,j), (i,j+1)] in laby.get_walls():
-                        # On supprime le mur à l'est de la cellule
-                        laby.remove_wall((i,j), (i,j+1))
-
-            # On ajoute le dernier mur à la séquence
-            sequence.append((i, width-1))
+                    # On supprime le mur à l'est de la cellule
+                    cells[k] |= EAST
 
-            # On tire au sort une cellule parmi la séquence
-            cell = choice(sequence)
-
-            # On vérifie si son mur au sud est accessible
-            if [cell, (cell[0]+1, cell[1])] in laby.get_walls():
-                # On supprime le mur au sud de la cellule
-                laby.remove_wall(cell, (cell[0]+1, cell[1]))
+            # On tire au sort une cellule parmi la séquence, qui se termine sur la dernière colonne
+            cells[choice(range(start, row+width))] |= SOUTH
 
         # On casse tous les mur à l'est de la dernière ligne
-        for cell_x in range(width-1):
-            laby.remove_wall((height-1, cell_x), (height-1, cell_x+1))
+        last = (height-1)*width
+        for k in range(last, last+width-1):
+            cells[k] |= EAST
 
         return laby
     
     @classmethod
-    def gen_fusion(cls, height: int, width: int):
+    def from_arrays(cls, east, south):
+        """
+        Construit un labyrinthe à partir de deux tableaux NumPy booléens height x width :
+        east[i, j] (resp. south[i, j]) vaut True si le mur à l'est (resp. au sud) de la cellule (i, j) est cassé.
+        """
+        from app import Vectorized
+
+        height, width = east.shape
+        return cls._from_cells(height, width, Vectorized.to_cells(east, south))
+
+    @classmethod
+    def gen_btree_numpy(cls, height: int, width: int, seed=None):
+        """
+        Génère un labyrinthe par arbre binaire avec NumPy (voir Vectorized.btree_arrays).
+        Les tirages viennent de numpy.random et non du module random :
+        pour un même seed, le labyrinthe diffère de celui de gen_btree.
+        """
+        from app import Vectorized
+
+        return cls.from_arrays(*Vectorized.btree_arrays(height, width, seed))
+
+    @classmethod
+    def gen_sidewinder_numpy(cls, height: int, width: int, seed=None):
+        """
+        Génère un labyrinthe par l'algorithme sidewinder avec NumPy (voir Vectorized.sidewinder_arrays).
+        Les tirages viennent de numpy.random et non du module random :
+        pour un même seed, le labyrinthe diffère de celui de gen_sidewinder.
+        """
+        from app import Vectorized
+
+        return cls.from_arrays(*Vectorized.sidewinder_arrays(height, width, seed))
+
+    @classmethod
+    def gen_tiled(cls, height: int, width: int, algorithm: str = "gen_exploration", tile: int = 256, workers: int = None, seed=None, rng=None):
+        """
+        Génère un grand labyrinthe parfait par tuiles de tile x tile cellules, produites en parallèle
+        par workers processus (autant que de coeurs par défaut) avec le générateur algorithm
+        ("gen_exploration", "gen_wilson", "gen_fusion"...). Voir le module Tiled.
+        Les arguments seed et rng sont décrits dans gen_btree ; sans eux, le module random est utilisé.
+        """
+        from app import Tiled
+
+        if rng is None:
+            rng = Random(seed) if seed is not None else random
+        return Tiled.generate(cls, height, width, algorithm, tile, workers, rng)
+
+    @classmethod
+    def generate_batch(cls, n: int, height: int, width: int, algorithm: str = "gen_exploration", seed=None, workers: int = None, chunk: int = 64):
+        """
+        Génère n labyrinthes de height x width cellules avec le générateur algorithm
+        ("gen_btree", "gen_sidewinder", "gen_fusion", "gen_exploration", "gen_wilson")
+        et les produit un par un (générateur Python).
+        Les tables d'adjacence de la forme sont calculées une seule fois (GridIndex) et les
+        labyrinthes sont tirés par paquets de chunk, chaque paquet partageant un même
+        random.Random initialisé depuis seed : le résultat ne dépend que de seed,
+        quel que soit le nombre de processus workers (aucun par défaut).
+        """
+        from app import Generators
+
+        assert algorithm in Generators.KERNELS, \
+            f"Erreur lors de la génération en série : {algorithm} n'est pas un générateur de Maze"
+        master = Random(seed)
+        counts = [min(chunk, n - start) for start in range(0, n, chunk)]
+        jobs = [(algorithm, height, width, master.getrandbits(64), count) for count in counts]
+
+        if not workers or workers <= 1:
+            for job in jobs:
+                for cells in Generators.generate_chunk(*job):
+                    yield cls._from_cells(height, width, cells)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_cells in pool.map(Generators.generate_chunk, *zip(*jobs)):
+                for cells in chunk_cells:
+                    yield cls._from_cells(height, width, cells)
+
+    @classmethod
+    def gen_fusion(cls, height: int, width: int, seed=None, rng=None):
         """
         Permet de générer un labyrinthe avec l'algorithme de fusion de chemin.
+        Les labels des cellules sont gérés par une structure Union-Find,
+        ce qui rend la génération quasi linéaire en nombre de murs.
+        Les arguments seed et rng sont décrits dans gen_btree.
         """
-        laby = cls(height, width)
+        if seed is None and rng is None:
+            rng = random
+        return cls._generate("gen_fusion", height, width, seed, rng)
 
-        # On labélise toutes les cellules de 1 à n
-        label_cells = {}
-        label = 1
-
-        for cell in laby.neighbors.keys():
-            label_cells[cell] = label
-            label += 1
-
-        # On extrait tous les murs dans une liste et on la mélange aléatoirement
-        walls = laby.get_walls()
-        shuffle(walls)
-
-        # On itère sur les murs mélangés aléatoirement
-        for w in walls:
-            # On vérifie que les deux cellules séparées par le mur n'ont pas le même label
-            if label_cells[w[0]] != label_cells[w[1]]:
-                # On casse le mur présent entre ces deux cellules
-                laby.remove_wall(w[0], w[1])
-            
-                # On récupère la liste des cellules ayant le même label que la deuxième cellule du mur
-                same_labels = [cell for cell in laby.neighbors.keys() if cell != w[0] if label_cells[cell] == label_cells[w[1]]]
-
-                # On ajoute le même label que la première cellules à toutes les cellules ayant le même label que la deuxième cellule incluse.
-                for cell in same_labels:
-                    label_cells[cell] = label_cells[w[0]]
-                
-        return laby
-        
     @classmethod
-    def gen_exploration(cls, height: int, width: int):
+    def gen_exploration(cls, height: int, width: int, seed=None, rng=None):
         """
         Cette méthode de classe permet de générer un labyrinthe parfait en utilisant l'algorithme de l'exploration exhaustive.
         Elle retourne un objet de type Maze.
@@ -259,6 +773,8 @@ class Maze:
         Args:
             height (int): la hauteur du labyrinthe à créer
             width (int): la largeur du labyrinthe à créer
+            seed (int): graine d'un générateur aléatoire dédié (voir gen_btree)
+            rng (random.Random): générateur aléatoire à utiliser à la place de seed
 
         Returns:
             laby: un objet de type Maze représentant le labyrinthe généré.
@@ -268,73 +784,65 @@ class Maze:
 
         Exemple d'utilisation :
             labyrinthe = Maze.gen_exploration(10, 10)
+            labyrinthe = Maze.gen_exploration(10, 10, seed=42)
         """
-        laby = cls(height, width)
-        
-        # On choisit une cellule au hasard dans le labyrinthe
-        cell = choice(list(laby.neighbors.keys()))
-
-        # On marque cette cellule comme étant visitée
-        visite = [cell]
-
-        # On ajoute cette cellule à une pile 
-        pile = [cell]
-
-        while pile:
-            # On dépile la cellule
-            c = pile.pop(0)
-
-            # On regarde les cellules contiguës et qui n'ont pas encore été visitée à la cellule qui vient d'être dépilée
-            no_visited = [cell for cell in laby.get_contiguous_cells(c) if cell not in visite]
-
-            if no_visited:
-                # On remet sur la pile la cellule qui vient d'être dépilée
-                pile.insert(0, c)
-
-                # On choisit au hasard l'une de ses cellules contiguës qui n'a pas été visité
-                cell = choice(no_visited)
-
-                # On casse le mur séparant les deux cellules
-                laby.remove_wall(c, cell)
-
-                # On marque la cellule choisie au hasard comme étant visitée
-                visite.append(cell)
-
-                # On rajoute sur la pile la cellule ayant été choisi
-                pile.insert(0, cell)
-
-        return laby
+        if seed is None and rng is None:
+            rng = random
+        return cls._generate("gen_exploration", height, width, seed, rng)
 
     @classmethod
-    def gen_wilson(cls, height: int, width: int):
+    def gen_wilson(cls, height: int, width: int, seed=None, rng=None):
         """
         Permet de générer un labyrinthe par l'algorithme de wilson
+        La marche aléatoire mémorise, pour chaque cellule, la dernière direction
+        empruntée depuis celle-ci : suivre ces directions depuis le départ
+        donne directement le chemin sans boucle.
+        Les arguments seed et rng sont décrits dans gen_btree.
         """
-        laby = cls(height, width)
-        cell = choice(list(laby.neighbors.keys()))
-        visited = [cell]
-
-        while len(visited) < len(laby.neighbors.keys()):
-            cell = choice(list(laby.neighbors.keys()))
-            while cell in visited:
-                cell = choice(list(laby.neighbors.keys()))
-            
-            path = [cell]
+        if seed is None and rng is None:
+            rng = random
+        return cls._generate("gen_wilson", height, width, seed, rng)
 
-            while path[-1] not in visited:
-                contigous_cell = choice(laby.get_contiguous_cells(path[-1]))
-
-                if contigous_cell in path:
-                    path = path[:path.index(contigous_cell)+1]
-                else:
-                    path.append(contigous_cell)
+    @classmethod
+    def gen_eller(cls, height: int, width: int, seed=None, rng=None):
+        """
+        Génère un labyrinthe parfait par l'algorithme d'Eller : les lignes sont produites
+        l'une après l'autre en ne retenant que l'ensemble de chaque cellule de la ligne courante.
+        Pour écrire un labyrinthe trop haut pour tenir en mémoire, voir stream_eller.
+        Les arguments seed et rng sont décrits dans gen_btree.
+        """
+        if seed is None and rng is None:
+            rng = random
+        return cls._generate("gen_eller", height, width, seed, rng)
 
-            for i in range(len(path)-1):
-                laby.remove_wall(path[i], path[i+1])
+    @classmethod
+    def stream_eller(cls, fileobj, height: int, width: int, seed=None, rng=None) -> None:
+        """
+        Génère un labyrinthe par l'algorithme d'Eller et écrit son rendu texte (tel que __str__)
+        dans le fichier texte ouvert fileobj, au fil des lignes : la mémoire utilisée
+        ne dépend que de width, quelle que soit la hauteur.
+        Les arguments seed et rng sont décrits dans gen_btree.
+        """
+        from app import Generators
 
-            visited += path[:-1]
+        if rng is None:
+            rng = Random(seed) if seed is not None else random
+        write = fileobj.write
+        for line in _render_rows(Generators.eller_rows(height, width, rng), width):
+            write(line)
+            write("\n")
 
-        return laby
+    @classmethod
+    def gen_prim(cls, height: int, width: int, seed=None, rng=None):
+        """
+        Génère un labyrinthe parfait par l'algorithme de Prim randomisé : on part d'une cellule
+        et on casse à chaque étape un mur tiré au hasard parmi ceux qui séparent
+        les cellules atteintes des autres (frontière avec retrait et tirage en O(1)).
+        Les arguments seed et rng sont décrits dans gen_btree.
+        """
+        if seed is None and rng is None:
+            rng = random
+        return cls._generate("gen_prim", height, width, seed, rng)
 
 
     def overlay(self, content=None):
@@ -343,98 +851,368 @@ class Maze:
         d'un labyrinthe avec du contenu dans les cellules
         Argument:
             content (dict) : dictionnaire tq content[cell] contient le caractère à afficher au milieu de la cellule
+                             (les cellules absentes du dictionnaire restent vides)
         Retour:
             string
         """
-        if content is None:
-            content = {(i,j):' ' for i in range(self.height) for j in range(self.width)}
-        else:
-            # Python >=3.9
-            #content = content | {(i, j): ' ' for i in range(
-            #    self.height) for j in range(self.width) if (i,j) not in content}
-            # Python <3.9
-            new_content = {(i, j): ' ' for i in range(self.height) for j in range(self.width) if (i,j) not in content}
-            content = {**content, **new_content}
-        txt = r""
-        # Première ligne
-        txt += "┏"
-        for j in range(self.width-1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width-1):
-            txt += " "+content[(0,j)]+" ┃" if (0,j+1) not in self.neighbors[(0,j)] else " "+content[(0,j)]+"  "
-        txt += " "+content[(0,self.width-1)]+" ┃\n"
-        # Lignes normales
-        for i in range(self.height-1):
-            txt += "┣"
-            for j in range(self.width-1):
-                txt += "━━━╋" if (i+1,j) not in self.neighbors[(i,j)] else "   ╋"
-            txt += "━━━┫\n" if (i+1,self.width-1) not in self.neighbors[(i,self.width-1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += " "+content[(i+1,j)]+" ┃" if (i+1,j+1) not in self.neighbors[(i+1,j)] else " "+content[(i+1,j)]+"  "
-            txt += "\n"
-        # Bas du tableau
-        txt += "┗"
-        for i in range(self.width-1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
-        return txt
+        return "\n".join(self.iter_lines(content)) + "\n"
+
+    def iter_lines(self, content=None):
+        """
+        Produit le rendu texte du labyrinthe ligne par ligne (sans retour à la ligne),
+        sans jamais construire le dessin complet.
+        Chaque ligne est assemblée par des tables de glyphes indexées par les bits des cellules ;
+        content (dict facultatif) n'est consulté que pour les lignes où il a des cellules.
+        """
+        height = self.height
+        width = self.width
+        cells = self._cells
+
+        # Contenu regroupé par ligne du labyrinthe : {ligne: {colonne: caractère}}
+        by_row = {}
+        if content:
+            for (i, j), char in content.items():
+                by_row.setdefault(i, {})[j] = char
+
+        rows = (bytes(cells[i*width:(i+1)*width]) for i in range(height))
+        return _render_rows(rows, width, by_row)
+
+    def write_to(self, fileobj, content=None) -> None:
+        """
+        Écrit le rendu texte du labyrinthe (tel que overlay) dans un fichier texte ouvert,
+        ligne par ligne, ce qui permet de rendre des labyrinthes trop grands pour tenir en une chaîne
+        """
+        write = fileobj.write
+        for line in self.iter_lines(content):
+            write(line)
+            write("\n")
     
 
-    def solve_dfs(self, start: tuple, end: tuple):
+    def to_image(self, dest: str, cell_px: int = 4, path=None) -> None:
+        """
+        Enregistre le labyrinthe en image dans le fichier dest (.pbm, .pgm ou .png selon
+        l'extension), chaque cellule occupant cell_px x cell_px pixels, murs compris.
+        path (facultatif) est un chemin à tracer, par exemple le résultat de solve_bfs.
+        L'image est produite ligne de pixels par ligne de pixels (voir le module Image) :
+        la mémoire ne dépend que de la largeur, même pour des grilles de 20 000 x 20 000.
+        """
+        from app import Image
+
+        Image.write(self, dest, cell_px, path)
+
+    def solve_dfs(self, start: tuple, end: tuple) -> SolveResult:
         """
         Permet de résoudre un labyrinthe avec le parcours en profondeur
+        Le prédécesseur d'une cellule n'est fixé qu'au moment où elle est dépilée
+        pour la première fois, ce qui garantit un chemin valide.
+        Quand le cache est activé, le chemin est lu dans l'arbre en largeur mis en cache.
         """
-        visite = []
-        pile = [start]
-        predecesseurs = {start: None}
+        if self._cache is not None:
+            return self.solve_bfs(start, end)
+
+        cells = self._cells
+        width = self.width
+        n = self.height*width
+        goal = self.cell_id(end)
+
+        visite = bytearray(n)
+        predecesseurs = array('l', [-1]) * n
+        expanded = 0
+
+        # La pile contient des couples (cellule, prédécesseur) mis à plat
+        first = self.cell_id(start)
+        pile = [first, first]
 
         while pile:
-            cell = pile.pop(0)
-            if cell == end:
-                path = []
-                while cell is not None:
-                    path.append(cell)
-                    cell = predecesseurs[cell]
-                
-                return path[::-1]
-            
-            visite.append(cell)
-            for n in self.neighbors[cell]:
-                if n not in visite:
-                    pile.insert(0, n)
-                    predecesseurs[n] = cell
-        
-        return visite
+            cell = pile.pop()
+            parent = pile.pop()
+            if visite[cell]:
+                continue
+            visite[cell] = 1
+            predecesseurs[cell] = parent
+            expanded += 1
+            if cell == goal:
+                break
 
+            bits = cells[cell]
+            if bits & EAST and not visite[cell+1]:
+                pile += (cell, cell+1)
+            if bits & SOUTH and not visite[cell+width]:
+                pile += (cell, cell+width)
+            if cell % width and cells[cell-1] & EAST and not visite[cell-1]:
+                pile += (cell, cell-1)
+            if cell >= width and cells[cell-width] & SOUTH and not visite[cell-width]:
+                pile += (cell, cell-width)
 
-    def solve_bfs(self, start: tuple, end: tuple):
+        result = SolveResult(None, expanded, predecesseurs, width)
+        result.path = result.path_to(end)
+        return result
+
+    def _bfs(self, first: int, goal: int = -1) -> tuple:
         """
-        Permet de résoudre un labyrinthe avec le parcours en largeur
+        Parcours en largeur depuis la cellule d'indice first, interrompu sur goal s'il est fourni.
+        Retourne le triplet (distances, predecesseurs, nombre de cellules développées),
+        les deux tableaux étant indexés par cell_id (-1 pour les cellules non atteintes).
         """
-        visite = []
-        file = [start]
-        predecesseurs = {start: None}
+        cells = self._cells
+        width = self.width
+        n = self.height*width
+
+        # Une distance positive marque la cellule comme visitée dès sa mise en file
+        distances = array('l', [-1]) * n
+        predecesseurs = array('l', [-1]) * n
+        expanded = 0
+
+        distances[first] = 0
+        predecesseurs[first] = first
+        file = deque([first])
+        popleft = file.popleft
+        push = file.append
 
         while file:
-            cell = file.pop(0)
-            if cell == end:
-                path = []
-                while cell is not None:
-                    path.append(cell)
-                    cell = predecesseurs[cell]
-                
-                return path[::-1]
-            
-            visite.append(cell)
-            for n in self.neighbors[cell]:
-                if n not in visite:
-                    file.append(n)
+            cell = popleft()
+            expanded += 1
+            if cell == goal:
+                break
+
+            d = distances[cell] + 1
+            bits = cells[cell]
+            if bits & EAST and distances[cell+1] < 0:
+                distances[cell+1] = d
+                predecesseurs[cell+1] = cell
+                push(cell+1)
+            if bits & SOUTH and distances[cell+width] < 0:
+                distances[cell+width] = d
+                predecesseurs[cell+width] = cell
+                push(cell+width)
+            if cell % width and cells[cell-1] & EAST and distances[cell-1] < 0:
+                distances[cell-1] = d
+                predecesseurs[cell-1] = cell
+                push(cell-1)
+            if cell >= width and cells[cell-width] & SOUTH and distances[cell-width] < 0:
+                distances[cell-width] = d
+                predecesseurs[cell-width] = cell
+                push(cell-width)
+
+        return distances, predecesseurs, expanded
+
+    def solve_bfs(self, start: tuple, end: tuple) -> SolveResult:
+        """
+        Permet de résoudre un labyrinthe avec le parcours en largeur
+        Le chemin renvoyé est un plus court chemin entre start et end.
+        """
+        if self._cache is not None:
+            # Copie : l'appelant peut modifier result.predecessors sans toucher au cache
+            _, predecesseurs, expanded = self._cache.tree(self, self.cell_id(start))
+            predecesseurs = predecesseurs[:]
+        else:
+            _, predecesseurs, expanded = self._bfs(self.cell_id(start), self.cell_id(end))
+        result = SolveResult(None, expanded, predecesseurs, self.width)
+        result.path = result.path_to(end)
+        return result
+
+    def distance_map(self, source: tuple) -> array:
+        """
+        Retourne, en un seul parcours en largeur, la distance de source à chaque cellule
+        sous forme d'un tableau plat indexé par cell_id (-1 pour les cellules inaccessibles)
+        """
+        if self._cache is not None:
+            # Copie du tableau gardé par le cache (une recopie mémoire, sans parcours)
+            return self._cache.tree(self, self.cell_id(source))[0][:]
+        return self._bfs(self.cell_id(source))[0]
+
+    def _passage_count(self) -> int:
+        """
+        Retourne le nombre de passages ouverts (murs cassés) du labyrinthe
+        """
+        cells = self._cells
+        return cells.count(EAST) + cells.count(SOUTH) + 2*cells.count(EAST | SOUTH)
+
+    def tree_index(self):
+        """
+        Retourne un TreeIndex si le labyrinthe est parfait (n-1 passages et connexe), None sinon
+        """
+        n = self.height*self.width
+        if n == 0 or self._passage_count() != n-1:
+            return None
+        # Avec n-1 passages, le labyrinthe est un arbre si et seulement s'il est connexe,
+        # c'est-à-dire sans cycle : un cycle laisse forcément une cellule hors d'atteinte
+        index = TreeIndex(self)
+        return index if index.acyclic and index.size == 2*n-1 else None
+
+    def junction_graph(self):
+        """
+        Retourne le graphe des carrefours du labyrinthe, où chaque couloir est contracté
+        en une arête pondérée : ses solveurs (solve_dijkstra, solve_astar, distance)
+        ne développent que les carrefours et culs-de-sac, et stats() donne la part
+        de cellules de couloir ainsi évitées. Construit en O(cellules), puis réutilisé
+        tant que les murs ne changent pas.
+        """
+        from app.JunctionGraph import JunctionGraph
+
+        if self._junctions is None or self._junctions.version != self._version:
+            self._junctions = JunctionGraph(self)
+        return self._junctions
+
+    def solve_many(self, pairs) -> list:
+        """
+        Résout une série de requêtes (start, end) sur le même labyrinthe.
+        Sur un labyrinthe parfait interrogé depuis plusieurs départs, on construit
+        une seule fois un index LCA et chaque requête se résout en O(log n) plus
+        la longueur du chemin. Sinon, on regroupe les requêtes par départ et
+        un seul arbre de parcours en largeur sert à toutes celles d'un même départ.
+        Retourne la liste des chemins (None quand il n'en existe pas), dans l'ordre des requêtes.
+        """
+        pairs = list(pairs)
+        paths = [None] * len(pairs)
+
+        by_source = {}
+        for q, (start, end) in enumerate(pairs):
+            by_source.setdefault(start, []).append(q)
+
+        index = self.tree_index() if len(by_source) > 1 else None
+        if index is not None:
+            for q, (start, end) in enumerate(pairs):
+                paths[q] = index.path(self.cell_id(start), self.cell_id(end))
+            return paths
+
+        for start, queries in by_source.items():
+            if self._cache is not None:
+                _, predecesseurs, expanded = self._cache.tree(self, self.cell_id(start))
+            else:
+                _, predecesseurs, expanded = self._bfs(self.cell_id(start))
+            tree = SolveResult(None, expanded, predecesseurs, self.width)
+            for q in queries:
+                paths[q] = tree.path_to(pairs[q][1])
+        return paths
+
+    def _open_moves(self, k: int) -> tuple:
+        """
+        Retourne les directions (codes de GridIndex) des passages ouverts de la cellule d'indice k.
+        Le tuple renvoyé est partagé (MOVES) : aucune allocation par appel.
+        """
+        cells = self._cells
+        width = self.width
+        bits = cells[k]
+        # EAST (1) devient le bit RIGHT (8), SOUTH (2) est déjà le bit DOWN
+        opened = (bits & EAST) << RIGHT | (bits & SOUTH)
+        if k % width and cells[k-1] & EAST:
+            opened |= 1 << LEFT
+        if k >= width and cells[k-width] & SOUTH:
+            opened |= 1 << UP
+        return MOVES[opened]
+
+    def _open_neighbors(self, k: int) -> list:
+        """
+        Retourne les indices des cellules accessibles depuis la cellule d'indice k
+        """
+        offsets = self.index.offsets
+        return [k + offsets[d] for d in self._open_moves(k)]
+
+    def solve_astar(self, start: tuple, end: tuple) -> SolveResult:
+        """
+        Permet de résoudre un labyrinthe avec l'algorithme A*, guidé par distance_man.
+        La distance de Manhattan ne surestime jamais la distance réelle : le chemin
+        renvoyé est un plus court chemin. Seules les cellules atteintes sont mémorisées.
+        """
+        cells = self._cells
+        width = self.width
+        offsets = self.index.offsets
+        goal = self.cell_id(end)
+        gi, gj = end
+
+        first = self.cell_id(start)
+        predecesseurs = {first: first}
+        costs = {first: 0}
+        # À f égal, on développe d'abord la cellule la plus éloignée du départ
+        heap = [(self.distance_man(start, end), 0, first)]
+        closed = set()
+        expanded = 0
+
+        while heap:
+            _, neg_g, cell = heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            expanded += 1
+            if cell == goal:
+                break
+
+            g = 1 - neg_g
+            bits = cells[cell]
+            opened = (bits & EAST) << RIGHT | (bits & SOUTH)
+            if cell % width and cells[cell-1] & EAST:
+                opened |= 1 << LEFT
+            if cell >= width and cells[cell-width] & SOUTH:
+                opened |= 1 << UP
+            for d in MOVES[opened]:
+                n = cell + offsets[d]
+                if n not in closed and g < costs.get(n, g+1):
+                    costs[n] = g
                     predecesseurs[n] = cell
-        
-        return visite
+                    i, j = divmod(n, width)
+                    heappush(heap, (g + abs(i - gi) + abs(j - gj), -g, n))
+
+        result = SolveResult(None, expanded, predecesseurs, width)
+        result.path = result.path_to(end)
+        return result
+
+    def solve_bidirectional(self, start: tuple, end: tuple) -> SolveResult:
+        """
+        Permet de résoudre un labyrinthe avec deux parcours en largeur lancés
+        depuis le départ et depuis l'arrivée. On développe à chaque tour
+        une couche complète du plus petit des deux fronts, et on s'arrête
+        à la fin de la première couche où les deux parcours se rencontrent.
+        """
+        width = self.width
+        offsets = self.index.offsets
+        open_moves = self._open_moves
+        first = self.cell_id(start)
+        goal = self.cell_id(end)
+
+        # Pour chaque sens : prédécesseurs, distances et front courant
+        forward = ({first: first}, {first: 0}, [first])
+        backward = ({goal: goal}, {goal: 0}, [goal])
+        expanded = 0
+        best = None
+        if first == goal:
+            best = (0, first, first)
+
+        while best is None and forward[2] and backward[2]:
+            side, other = (forward, backward) if len(forward[2]) <= len(backward[2]) else (backward, forward)
+            preds, dists, front = side
+            other_dists = other[1]
+
+            next_front = []
+            for cell in front:
+                expanded += 1
+                d = dists[cell] + 1
+                for move in open_moves(cell):
+                    n = cell + offsets[move]
+                    if n in other_dists:
+                        total = d + other_dists[n]
+                        if best is None or total < best[0]:
+                            best = (total, cell, n) if side is forward else (total, n, cell)
+                    if n not in dists:
+                        dists[n] = d
+                        preds[n] = cell
+                        next_front.append(n)
+            side[2][:] = next_front
+
+        predecesseurs = forward[0]
+        result = SolveResult(None, expanded, predecesseurs, width)
+        if best is not None:
+            # On raccroche la moitié arrière du chemin à l'arbre du départ
+            _, meet_f, meet_b = best
+            back_preds = backward[0]
+            parent, cell = meet_f, meet_b
+            while True:
+                predecesseurs[cell] = parent
+                if cell == goal:
+                    break
+                parent, cell = cell, back_preds[cell]
+            result.path = result.path_to(end)
+        return result
     
 
     def distance_man(self, c1: tuple, c2: tuple):
@@ -451,30 +1229,4 @@ class Maze:
         Retour:
              chaîne (str) : chaîne de caractères représentant le labyrinthe
         """
-        txt = ""
-        # Première ligne
-        txt += "┏"
-        for j in range(self.width-1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width-1):
-            txt += "   ┃" if (0,j+1) not in self.neighbors[(0,j)] else "    "
-        txt += "   ┃\n"
-        # Lignes normales
-        for i in range(self.height-1):
-            txt += "┣"
-            for j in range(self.width-1):
-                txt += "━━━╋" if (i+1,j) not in self.neighbors[(i,j)] else "   ╋"
-            txt += "━━━┫\n" if (i+1,self.width-1) not in self.neighbors[(i,self.width-1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += "   ┃" if (i+1,j+1) not in self.neighbors[(i+1,j)] else "    "
-            txt += "\n"
-        # Bas du tableau
-        txt += "┗"
-        for i in range(self.width-1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
-
-        return txt
\ No newline at end of file
+        return "\n".join(self.iter_lines()) + "\n"
@@ -0,0 +1,74 @@
+import hashlib
+import os
+
+from app import Generators
+from app.Maze import Maze
+
+
+class MazeCache:
+    """
+    Classe Cache de labyrinthes
+    Cache sur disque des labyrinthes générés avec une graine. Un quadruplet
+    (algorithme, hauteur, largeur, graine) détermine entièrement un labyrinthe :
+    son empreinte SHA-256 sert d'adresse au fichier (format de Maze.save),
+    rangé dans un sous-dossier nommé par les deux premiers caractères de l'empreinte.
+    """
+    def __init__(self, directory: str):
+        """
+        Constructeur d'un cache stocké dans le dossier directory (créé au besoin)
+        """
+        self.directory = directory
+        self.hits      = 0
+        self.misses    = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(algorithm: str, height: int, width: int, seed) -> str:
+        """
+        Retourne l'empreinte identifiant le labyrinthe (algorithm, height, width, seed)
+        """
+        assert seed is not None, "Erreur de cache : seul un labyrinthe généré avec une graine est reproductible"
+        description = f"{Generators.VERSION}:{algorithm}:{height}:{width}:{seed!r}"
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Retourne le chemin du fichier correspondant à l'empreinte key
+        """
+        return os.path.join(self.directory, key[:2], key + ".maze")
+
+    def get(self, algorithm: str, height: int, width: int, seed, mapped: bool = False):
+        """
+        Retourne le labyrinthe en cache (projeté en mémoire si mapped), ou None s'il n'y est pas
+        """
+        path = self.path(self.key(algorithm, height, width, seed))
+        if not os.path.exists(path):
+            return None
+        return Maze.load(path, mapped=mapped)
+
+    def put(self, algorithm: str, height: int, width: int, seed, laby: Maze) -> str:
+        """
+        Enregistre laby sous l'empreinte de (algorithm, height, width, seed) et retourne le chemin du fichier.
+        L'écriture passe par un fichier temporaire renommé, pour ne jamais exposer un fichier incomplet.
+        """
+        path = self.path(self.key(algorithm, height, width, seed))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        laby.save(temporary)
+        os.replace(temporary, path)
+        return path
+
+    def get_or_generate(self, algorithm: str, height: int, width: int, seed, mapped: bool = False) -> Maze:
+        """
+        Retourne le labyrinthe (algorithm, height, width, seed), depuis le cache s'il y est,
+        sinon en le générant avec Maze.<algorithm>(height, width, seed=seed) puis en l'enregistrant
+        """
+        laby = self.get(algorithm, height, width, seed, mapped)
+        if laby is not None:
+            self.hits += 1
+            return laby
+
+        self.misses += 1
+        laby = getattr(Maze, algorithm)(height, width, seed=seed)
+        self.put(algorithm, height, width, seed, laby)
+        return laby
@@ -0,0 +1,144 @@
+import struct
+
+# Format binaire d'un labyrinthe :
+#   - en-tête : signature, version du format, hauteur et largeur
+#   - 2 bits par cellule (bits EAST et SOUTH), 4 cellules par octet,
+#     la cellule d'indice k occupant les bits 2*(k%4) et 2*(k%4)+1 de l'octet k//4
+MAGIC   = b"MAZE"
+VERSION = 1
+HEADER  = struct.Struct("<4sBxxxQQ")
+
+# Nombre de cellules traitées d'un bloc lors de la conversion, pour borner la mémoire
+CHUNK = 1 << 20
+
+
+def pack(cells) -> bytes:
+    """
+    Compacte des cellules (un octet par cellule) à raison de 4 cellules par octet.
+    On combine des entiers de précision arbitraire : chaque octet valant au plus 3,
+    les décalages de 2, 4 et 6 bits ne débordent jamais sur l'octet voisin.
+    """
+    cells = bytes(cells)
+    cells += bytes(-len(cells) % 4)
+    size = len(cells) // 4
+    packed = 0
+    for shift in range(4):
+        packed |= int.from_bytes(cells[shift::4], "little") << (2*shift)
+    return packed.to_bytes(size, "little")
+
+
+def unpack(data, count: int) -> bytearray:
+    """
+    Opération inverse de pack : retourne les count premières cellules, un octet par cellule
+    """
+    size = len(data)
+    packed = int.from_bytes(data, "little")
+    mask = int.from_bytes(b"\x03" * size, "little")
+    cells = bytearray(4*size)
+    for shift in range(4):
+        cells[shift::4] = ((packed >> (2*shift)) & mask).to_bytes(size, "little")
+    del cells[count:]
+    return cells
+
+
+def write_header(fileobj, height: int, width: int) -> None:
+    """
+    Écrit l'en-tête d'un labyrinthe de height x width cellules
+    """
+    fileobj.write(HEADER.pack(MAGIC, VERSION, height, width))
+
+
+def read_header(data) -> tuple:
+    """
+    Lit l'en-tête au début de data et retourne le couple (hauteur, largeur)
+    """
+    assert len(data) >= HEADER.size, "Erreur lors de la lecture du labyrinthe : fichier tronqué"
+    magic, version, height, width = HEADER.unpack_from(data)
+    assert magic == MAGIC, "Erreur lors de la lecture du labyrinthe : ce n'est pas un fichier de labyrinthe"
+    assert version == VERSION, f"Erreur lors de la lecture du labyrinthe : version {version} du format non prise en charge"
+    return height, width
+
+
+class PackedCells:
+    """
+    Classe Cellules compactées
+    Accès aux cellules d'un fichier de labyrinthe projeté en mémoire (mmap),
+    sans le charger : chaque lecture décode les 2 bits de la cellule demandée.
+    S'utilise à la place du tableau d'octets Maze._cells (indexation, tranches,
+    itération, count). L'écriture n'est possible que si la projection l'autorise.
+    """
+    __slots__ = ("buffer", "offset", "length", "writable")
+
+    def __init__(self, buffer, offset: int, length: int, writable: bool = False):
+        """
+        Constructeur d'une vue sur length cellules stockées à partir de l'octet offset de buffer
+        """
+        self.buffer   = buffer
+        self.offset   = offset
+        self.length   = length
+        self.writable = writable
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            start, stop, step = k.indices(self.length)
+            if step != 1:
+                return bytearray(self[i] for i in range(start, stop, step))
+            return self.read(start, stop)
+        if k < 0:
+            k += self.length
+        if not 0 <= k < self.length:
+            raise IndexError("indice de cellule hors du labyrinthe")
+        return (self.buffer[self.offset + (k >> 2)] >> ((k & 3) << 1)) & 3
+
+    def __setitem__(self, k: int, bits: int) -> None:
+        if not self.writable:
+            raise TypeError("labyrinthe ouvert en lecture seule")
+        if not 0 <= k < self.length:
+            raise IndexError("indice de cellule hors du labyrinthe")
+        i = self.offset + (k >> 2)
+        shift = (k & 3) << 1
+        self.buffer[i] = (self.buffer[i] & ~(3 << shift)) | ((bits & 3) << shift)
+
+    def read(self, start: int, stop: int) -> bytearray:
+        """
+        Décode les cellules d'indices start à stop-1, un octet par cellule
+        """
+        if stop <= start:
+            return bytearray()
+        first = start >> 2
+        last = (stop + 3) >> 2
+        cells = unpack(self.buffer[self.offset + first:self.offset + last], 4*(last - first))
+        return cells[start - 4*first:stop - 4*first]
+
+    def write(self, start: int, cells) -> None:
+        """
+        Écrit les cellules cells (un octet par cellule) à partir de l'indice start,
+        en réencodant les octets du fichier concernés (les cellules voisines qui partagent
+        le premier ou le dernier octet sont conservées)
+        """
+        if not self.writable:
+            raise TypeError("labyrinthe ouvert en lecture seule")
+        stop = start + len(cells)
+        if not 0 <= start <= stop <= self.length:
+            raise IndexError("indice de cellule hors du labyrinthe")
+        if stop == start:
+            return
+        # On étend la tranche aux frontières d'octets avec les cellules déjà stockées
+        first = start & ~3
+        last = min((stop + 3) & ~3, self.length)
+        cells = self.read(first, start) + bytes(cells) + self.read(stop, last)
+        data = pack(cells)
+        self.buffer[self.offset + (first >> 2):self.offset + (first >> 2) + len(data)] = data
+
+    def __iter__(self):
+        for start in range(0, self.length, CHUNK):
+            yield from self.read(start, min(start + CHUNK, self.length))
+
+    def count(self, bits: int) -> int:
+        """
+        Nombre de cellules valant exactement bits
+        """
+        return sum(self.read(start, min(start + CHUNK, self.length)).count(bits) for start in range(0, self.length, CHUNK))
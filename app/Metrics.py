@@ -0,0 +1,191 @@
+# Statistiques de forme d'un labyrinthe, pour comparer les générateurs entre eux :
+# culs-de-sac, carrefours, facteur de rivière, diamètre, longueur moyenne des solutions
+# et distribution des longueurs de couloirs. Les comptes par cellule se font sur les
+# octets des cellules, sans boucle Python ; le reste tient en deux parcours en largeur.
+import random
+from array import array
+from collections import Counter
+
+from app.JunctionGraph import _degrees, _next
+from app.Maze import EAST, SOUTH
+
+
+def _sweep(maze, first: int) -> tuple:
+    """
+    Parcours en largeur depuis la cellule first. Retourne (distances, prédécesseurs, ordre
+    de découverte) ; la dernière cellule découverte est l'une des plus éloignées de first.
+    """
+    cells = maze._cells
+    width = maze.width
+    n = maze.height*width
+    distances = array('l', [-1]) * n
+    parents = array('l', [-1]) * n
+    distances[first] = 0
+    parents[first] = first
+    # La liste sert de file : on la parcourt pendant qu'elle s'allonge
+    order = [first]
+    push = order.append
+    for cell in order:
+        d = distances[cell] + 1
+        bits = cells[cell]
+        if bits & EAST and distances[cell+1] < 0:
+            distances[cell+1] = d
+            parents[cell+1] = cell
+            push(cell+1)
+        if bits & SOUTH and distances[cell+width] < 0:
+            distances[cell+width] = d
+            parents[cell+width] = cell
+            push(cell+width)
+        if cell % width and cells[cell-1] & EAST and distances[cell-1] < 0:
+            distances[cell-1] = d
+            parents[cell-1] = cell
+            push(cell-1)
+        if cell >= width and cells[cell-width] & SOUTH and distances[cell-width] < 0:
+            distances[cell-width] = d
+            parents[cell-width] = cell
+            push(cell-width)
+    return distances, parents, order
+
+
+def _mean_tree_distance(parents, order: list) -> float:
+    """
+    Distance moyenne entre deux cellules distinctes d'un arbre couvrant, sur tous les couples :
+    l'arête qui relie une cellule à son parent est empruntée par s*(n-s) couples,
+    s étant la taille du sous-arbre de la cellule (indice de Wiener)
+    """
+    n = len(order)
+    if n < 2:
+        return 0.0
+    sizes = array('l', [1]) * len(parents)
+    total = 0
+    for k in reversed(order[1:]):
+        s = sizes[k]
+        sizes[parents[k]] += s
+        total += s*(n - s)
+    return total / (n*(n - 1) // 2)
+
+
+def _corridors(maze, degrees: bytes, sample: int, rng) -> list:
+    """
+    Longueurs (en passages) des couloirs partant de sample noeuds tirés au hasard
+    (cellules qui n'ont pas exactement deux passages). Chaque couloir ayant deux extrémités,
+    les longueurs obtenues suivent la même distribution que celles de tous les couloirs.
+    """
+    n = len(degrees)
+    if degrees.count(2) == n:
+        return []
+    cells = maze._cells
+    width = maze.width
+    offsets = maze.index.offsets
+    open_moves = maze._open_moves
+    lengths = []
+    for _ in range(sample):
+        node = rng.randrange(n)
+        while degrees[node] == 2:
+            node = rng.randrange(n)
+        for d in open_moves(node):
+            prev, cur = node, node + offsets[d]
+            length = 1
+            while degrees[cur] == 2 and cur != node:
+                prev, cur = cur, _next(cells, width, prev, cur)
+                length += 1
+            lengths.append(length)
+    return lengths
+
+
+def metrics(maze, sample: int = None, pairs: int = 64, rng=None) -> dict:
+    """
+    Statistiques du labyrinthe :
+        dead_ends, junctions, isolated : cellules à 1, 3 ou 4, et 0 passages
+        branching : nombre moyen de sorties d'un carrefour
+        river : part des cellules de couloir (exactement 2 passages), élevée quand
+                le labyrinthe forme de longues rivières peu ramifiées
+        diameter, diameter_ends : plus long plus court chemin et ses extrémités, par deux
+                parcours en largeur (exact sur un arbre, minorant sinon ; limité à la
+                composante de la cellule (0, 0))
+        mean_path : longueur moyenne du chemin entre deux cellules distinctes : exacte sur tous
+                les couples pour un labyrinthe parfait, estimée sinon sur pairs couples tirés
+                au hasard parmi ceux qui sont reliés (None si aucun ne l'est)
+        unreachable : nombre de couples tirés qui ne sont pas reliés (0 pour un labyrinthe parfait)
+        corridors : {"count", "mean", "max", "histogram" (longueur -> nombre)} des couloirs
+                entre deux noeuds, comptés sur le graphe des carrefours ou, si sample est
+                fourni, estimés depuis sample noeuds tirés au hasard
+        perfect, sampled
+    Un labyrinthe sans cellule donne les mêmes clés, à zéro ou None.
+    sample est le mode des très grands labyrinthes : il évite la construction du graphe
+    des carrefours. rng est le générateur des tirages (module random par défaut).
+    """
+    rng = rng or random
+    height, width = maze.height, maze.width
+    n = height*width
+    if n == 0:
+        return {
+            "cells": 0, "dead_ends": 0, "junctions": 0, "isolated": 0, "branching": 0.0, "river": 0.0,
+            "diameter": 0, "diameter_ends": None, "mean_path": None, "unreachable": 0,
+            "corridors": {"count": 0, "mean": 0.0, "max": 0, "histogram": {}},
+            "perfect": False, "sampled": sample is not None,
+        }
+
+    degrees = _degrees(maze)
+    counts = [degrees.count(d) for d in range(5)]
+    junctions = counts[3] + counts[4]
+
+    # Deux parcours : le plus éloigné de (0, 0), puis le plus éloigné de celui-ci
+    _, _, order = _sweep(maze, 0)
+    first = order[-1]
+    distances, parents, order = _sweep(maze, first)
+    last = order[-1]
+    passages = (counts[1] + 2*counts[2] + 3*counts[3] + 4*counts[4]) // 2
+    perfect = len(order) == n and passages == n - 1
+
+    unreachable = 0
+    if perfect:
+        mean_path = _mean_tree_distance(parents, order)
+    else:
+        # Un labyrinthe qui n'est pas parfait a au moins deux cellules
+        lengths = []
+        graph = maze.junction_graph() if sample is None else None
+        for _ in range(pairs):
+            # Deux cellules distinctes, uniformément
+            k1 = rng.randrange(n)
+            k2 = rng.randrange(n - 1)
+            if k2 >= k1:
+                k2 += 1
+            c1, c2 = divmod(k1, width), divmod(k2, width)
+            if graph is not None:
+                length = graph.distance(c1, c2)
+            else:
+                result = maze.solve_bidirectional(c1, c2)
+                length = len(result) - 1 if result.found else None
+            if length is None:
+                unreachable += 1
+            else:
+                lengths.append(length)
+        mean_path = sum(lengths) / len(lengths) if lengths else None
+
+    if sample is None:
+        corridors = maze.junction_graph().edge_length
+    else:
+        corridors = _corridors(maze, degrees, sample, rng)
+    histogram = Counter(corridors)
+
+    return {
+        "cells": n,
+        "dead_ends": counts[1],
+        "junctions": junctions,
+        "isolated": counts[0],
+        "branching": (3*counts[3] + 4*counts[4]) / junctions if junctions else 0.0,
+        "river": counts[2] / n,
+        "diameter": distances[last],
+        "diameter_ends": (divmod(first, width), divmod(last, width)),
+        "mean_path": mean_path,
+        "unreachable": unreachable,
+        "corridors": {
+            "count": len(corridors),
+            "mean": sum(corridors) / len(corridors) if corridors else 0.0,
+            "max": max(corridors, default=0),
+            "histogram": dict(sorted(histogram.items())),
+        },
+        "perfect": perfect,
+        "sampled": sample is not None,
+    }
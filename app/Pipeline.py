@@ -0,0 +1,248 @@
+# Exécution en lot de travaux sur des labyrinthes (générer, modifier, résoudre,
+# valider, rendre), lus au fil de l'eau dans un fichier JSONL ou dans un script
+# de commandes à la manière de tests.py, avec un enregistrement JSON par travail
+# (résultats et durée de chaque étape). Point d'entrée : python tests.py <fichier>.
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.Maze import Maze
+
+# Générateurs de tests.py qui ne sont pas des méthodes gen_* de Maze
+_SHAPES = {
+    "gen_empty_maze": lambda height, width, seed=None: Maze(height, width, empty=True),
+    "gen_full_maze": lambda height, width, seed=None: Maze(height, width),
+}
+
+
+def parse_command(line: str, job: dict):
+    """
+    Traduit une ligne de script (syntaxe de tests.py) : une commande /gen_* ouvre un nouveau
+    travail et le retourne, les autres complètent job. Lignes vides et commentaires (#) ignorés.
+    Commandes : /gen_* <hauteur> <largeur> [graine], /add_wall et /remove_wall <l1> <c1> <l2> <c2>,
+    /solve_* [<l1> <c1> <l2> <c2>], /validate, /render [fichier texte ou image .png, .pgm, .pbm].
+    """
+    words = line.split()
+    if not words or words[0].startswith("#"):
+        return None
+    cmd, args = words[0].lstrip("/"), words[1:]
+    if cmd.startswith("gen_"):
+        assert len(args) >= 2, f"Erreur : {cmd} attend une hauteur et une largeur"
+        new = {"algorithm": cmd, "height": int(args[0]), "width": int(args[1])}
+        if len(args) > 2:
+            new["seed"] = int(args[2])
+        return new
+
+    assert job is not None, f"Erreur : {cmd} doit suivre une commande /gen_*"
+    if cmd in ("add_wall", "remove_wall"):
+        assert len(args) == 4, f"Erreur : {cmd} attend les coordonnées de deux cellules"
+        values = list(map(int, args))
+        job.setdefault("edits", []).append([cmd, values[:2], values[2:]])
+    elif cmd.startswith("solve_"):
+        query = {"solver": cmd}
+        if args:
+            assert len(args) == 4, f"Erreur : {cmd} attend les coordonnées du départ et de l'arrivée"
+            values = list(map(int, args))
+            query["start"], query["end"] = values[:2], values[2:]
+        job.setdefault("solve", []).append(query)
+    elif cmd == "validate":
+        job["validate"] = True
+    elif cmd == "render":
+        job["render"] = args[0] if args else True
+    else:
+        raise ValueError(f"La commande {cmd} n'existe pas")
+    return None
+
+
+def read_jobs(lines):
+    """
+    Produit les travaux au fil des lignes : une ligne commençant par '{' est un travail JSON
+    complet, les autres sont des commandes de script regroupées derrière leur /gen_*.
+    Chaque travail reçoit un numéro "id" (son rang) s'il n'en a pas.
+    Une ligne illisible n'interrompt pas le lot : son travail porte une clé "error",
+    n'est pas exécuté, et ses commandes suivantes sont ignorées jusqu'au prochain /gen_*.
+    """
+    job = None
+    count = 0
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if text.startswith("{"):
+            if job is not None:
+                yield job
+            job = None
+            try:
+                item = json.loads(text)
+                assert isinstance(item, dict), "Erreur : un travail JSON doit être un objet"
+            except Exception as error:
+                item = {"error": f"ligne {number} : {type(error).__name__}: {error}"}
+            item.setdefault("id", count)
+            count += 1
+            yield item
+            continue
+
+        words = text.split()
+        starts = bool(words) and words[0].lstrip("/").startswith("gen_")
+        if job is not None and "error" in job and not starts:
+            continue
+        try:
+            new = parse_command(text, job)
+        except Exception as error:
+            message = f"ligne {number} : {type(error).__name__}: {error}"
+            if not starts and job is not None:
+                job["error"] = message
+                continue
+            # /gen_* illisible ou commande qui ne suit aucun /gen_* : travail en erreur à part
+            new = {"error": message}
+        if new is not None:
+            if job is not None:
+                yield job
+            new["id"] = count
+            count += 1
+            job = new
+    if job is not None:
+        yield job
+
+
+def run_job(job: dict) -> dict:
+    """
+    Exécute un travail et retourne son enregistrement : identifiant, résultats de chaque étape
+    (longueur des chemins en pas, None si l'arrivée n'est pas atteinte)
+    et durée de chaque étape en secondes ("seconds"). Une erreur est enregistrée
+    (clé "error") au lieu d'interrompre le lot.
+    """
+    record = {"id": job.get("id")}
+    seconds = record["seconds"] = {}
+    if "error" in job:
+        # Travail illisible (voir read_jobs)
+        record["error"] = job["error"]
+        return record
+
+    def stage(name: str, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        seconds[name] = round(time.perf_counter() - start, 6)
+        return result
+
+    try:
+        algorithm = job["algorithm"]
+        height, width = job["height"], job["width"]
+        if algorithm in _SHAPES:
+            generate = _SHAPES[algorithm]
+        else:
+            assert algorithm.startswith("gen_") and hasattr(Maze, algorithm), f"Erreur : générateur inconnu {algorithm!r}"
+            generate = getattr(Maze, algorithm)
+        laby = stage("generate", lambda: generate(height, width, seed=job.get("seed")))
+        record["maze"] = [height, width]
+
+        if job.get("edits"):
+            def edit():
+                for action, c1, c2 in job["edits"]:
+                    assert action in ("add_wall", "remove_wall"), f"Erreur : modification inconnue {action!r}"
+                    getattr(laby, action)(tuple(c1), tuple(c2))
+            stage("edits", edit)
+
+        solutions = {}
+        path = None
+        for query in job.get("solve", ()):
+            if isinstance(query, str):
+                query = {"solver": query}
+            solver = query["solver"]
+            assert solver.startswith("solve_") and solver != "solve_many" and hasattr(laby, solver), \
+                f"Erreur : solveur inconnu {solver!r}"
+            start = tuple(query.get("start", (0, 0)))
+            end = tuple(query.get("end", (height-1, width-1)))
+            result = stage(solver, getattr(laby, solver), start, end)
+            # Longueur en pas (cellules du chemin moins une), comme dans Metrics
+            solutions[solver] = {"length": len(result) - 1 if result.found else None, "visited": result.visited}
+            if path is None:
+                path = result.path
+        if solutions:
+            record["solve"] = solutions
+
+        if job.get("validate"):
+            report = stage("validate", laby.validate)
+            record["validate"] = {
+                "perfect": report["perfect"],
+                "components": report["components"]["count"],
+                "cycles": report["cycles"]["count"],
+                "coherent": report["coherence"]["ok"] and report["orthogonal"]["ok"],
+            }
+
+        render = job.get("render")
+        if render:
+            # Même rendu que tests.py : chemin du premier solveur, départ 'D' et arrivée 'A'
+            content = None
+            if path:
+                content = dict.fromkeys(path, "*")
+                content[path[0]], content[path[-1]] = "D", "A"
+            if isinstance(render, str) and render.lower().endswith((".png", ".pgm", ".pbm")):
+                stage("render", laby.to_image, render, 4, path)
+                record["render"] = render
+            elif isinstance(render, str):
+                def write():
+                    with open(render, "w", encoding="utf-8") as fileobj:
+                        laby.write_to(fileobj, content)
+                stage("render", write)
+                record["render"] = render
+            else:
+                record["render"] = stage("render", laby.overlay, content)
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    return record
+
+
+def run(jobs, workers: int = 1, window: int = None):
+    """
+    Exécute les travaux et produit leurs enregistrements dans l'ordre des travaux.
+    Avec workers > 1, les travaux sont répartis sur un groupe de processus ; au plus
+    window travaux (4 par processus par défaut) sont en cours à la fois, ce qui permet
+    de traiter un flux de travaux sans le lire en entier.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield run_job(job)
+        return
+
+    window = window or 4*workers
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(run_job, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv) -> int:
+    """
+    Point d'entrée en ligne de commande : lit les travaux, écrit un enregistrement JSON
+    par ligne et retourne 1 si un travail a échoué, 0 sinon
+    """
+    parser = argparse.ArgumentParser(prog="tests.py", description="Exécution en lot de travaux sur des labyrinthes")
+    parser.add_argument("source", help="fichier JSONL ou script de commandes ('-' pour l'entrée standard)")
+    parser.add_argument("--workers", type=int, default=1, help="nombre de processus (1 : dans le processus courant)")
+    parser.add_argument("--output", metavar="FICHIER", help="fichier des enregistrements JSON (sortie standard par défaut)")
+    parser.add_argument("--render", action="store_true", help="rend le labyrinthe de chaque travail, même s'il ne le demande pas")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.source == "-" else open(args.source, encoding="utf-8")
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = False
+    try:
+        jobs = read_jobs(source)
+        if args.render:
+            jobs = ({**job, "render": job.get("render") or True} for job in jobs)
+        for record in run(jobs, args.workers):
+            failed = failed or "error" in record
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+
+class SolveCache:
+    """
+    Classe Cache de résolution
+    Garde en mémoire les arbres de parcours en largeur d'un labyrinthe,
+    indexés par cell_id de la cellule de départ, avec éviction LRU
+    sous un budget mémoire exprimé en octets.
+    Chaque arbre est daté par la version du labyrinthe au moment de son calcul.
+    Le labyrinthe signale ses modifications au cache (record) : un arbre
+    plus ancien est revalidé sans recalcul quand aucune des modifications
+    survenues depuis ne change les distances depuis son départ.
+    """
+    def __init__(self, budget: int):
+        """
+        Constructeur d'un cache pouvant occuper au plus budget octets
+        """
+        self.budget      = budget
+        self.size        = 0
+        self.hits        = 0
+        self.misses      = 0
+        self.revalidated = 0
+        # départ -> [version, distances, predecesseurs, nombre de cellules développées]
+        self._entries    = OrderedDict()
+        # modifications (version, ajout de mur ?, indice 1, indice 2) dans l'ordre
+        self._edits      = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Retourne les compteurs du cache
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "budget": self.budget,
+        }
+
+    def clear(self) -> None:
+        """
+        Vide le cache (les compteurs sont conservés)
+        """
+        self._entries.clear()
+        self._edits.clear()
+        self.size = 0
+
+    def record(self, version: int, added: bool, a: int, b: int) -> None:
+        """
+        Enregistre la modification du passage entre les cellules a et b,
+        qui a amené le labyrinthe à la version donnée.
+        added vaut True pour un mur ajouté, False pour un mur supprimé.
+        """
+        if not self._entries:
+            return
+        self._edits.append((version, added, a, b))
+        # Au-delà d'un certain volume, rejouer le journal coûterait plus qu'un recalcul
+        if len(self._edits) > 4096:
+            self.clear()
+
+    def tree(self, maze, source: int) -> tuple:
+        """
+        Retourne l'arbre de parcours en largeur (distances, predecesseurs, développées)
+        depuis la cellule source, en le calculant si besoin.
+        Les tableaux sont ceux du cache : ils ne doivent être ni modifiés ni transmis
+        tels quels à l'utilisateur (les méthodes publiques de Maze en renvoient des copies).
+        """
+        entry = self._entries.get(source)
+        if entry is not None:
+            if entry[0] == maze._version or self._still_valid(entry):
+                if entry[0] != maze._version:
+                    self.revalidated += 1
+                    entry[0] = maze._version
+                self.hits += 1
+                self._entries.move_to_end(source)
+                self._trim()
+                return entry[1], entry[2], entry[3]
+            self._forget(source)
+
+        self.misses += 1
+        distances, predecesseurs, expanded = maze._bfs(source)
+        cost = distances.itemsize*len(distances) + predecesseurs.itemsize*len(predecesseurs)
+        if cost <= self.budget:
+            while self._entries and self.size + cost > self.budget:
+                self._forget(next(iter(self._entries)))
+            self._entries[source] = [maze._version, distances, predecesseurs, expanded]
+            self.size += cost
+        self._trim()
+        return distances, predecesseurs, expanded
+
+    def _still_valid(self, entry) -> bool:
+        """
+        Indique si les modifications postérieures à l'arbre laissent ses distances inchangées :
+          - un mur ajouté hors de l'arbre ne raccourcit ni n'allonge aucun chemin de l'arbre
+          - un mur supprimé entre deux cellules dont les distances diffèrent d'au plus 1
+            (ou toutes deux inaccessibles) ne crée aucun raccourci
+        """
+        version, distances, predecesseurs, _ = entry
+        for edit_version, added, a, b in self._edits:
+            if edit_version <= version:
+                continue
+            if added:
+                if predecesseurs[a] == b or predecesseurs[b] == a:
+                    return False
+            else:
+                da = distances[a]
+                db = distances[b]
+                if (da < 0) != (db < 0) or abs(da - db) > 1:
+                    return False
+        return True
+
+    def _forget(self, source: int) -> None:
+        """
+        Retire l'arbre du départ source
+        """
+        entry = self._entries.pop(source)
+        self.size -= entry[1].itemsize*len(entry[1]) + entry[2].itemsize*len(entry[2])
+
+    def _trim(self) -> None:
+        """
+        Oublie les modifications antérieures à tous les arbres en cache
+        """
+        if not self._entries:
+            self._edits.clear()
+        elif self._edits:
+            oldest = min(entry[0] for entry in self._entries.values())
+            self._edits = [edit for edit in self._edits if edit[0] > oldest]
@@ -0,0 +1,64 @@
+class SolveResult:
+    """
+    Classe Résultat de résolution
+    Regroupe ce que produit un solveur de labyrinthe :
+      - path : liste des cellules du départ à l'arrivée, ou None s'il n'existe aucun chemin
+      - visited : nombre de cellules développées par le solveur
+      - predecessors : tableau plat indexé par cell_id, contenant l'indice de la cellule
+        précédente dans l'arbre de parcours (-1 si la cellule n'a pas été atteinte,
+        l'indice de la cellule elle-même pour le départ). Les solveurs qui ne parcourent
+        qu'une petite partie de la grille (A*, bidirectionnel) utilisent à la place
+        un dictionnaire ne contenant que les cellules atteintes.
+    Un résultat s'itère comme le chemin trouvé, ce qui permet de l'utiliser
+    comme l'ancienne liste de cellules renvoyée par les solveurs.
+    """
+    __slots__ = ("path", "visited", "predecessors", "width")
+
+    def __init__(self, path, visited: int, predecessors, width: int):
+        """
+        Constructeur d'un résultat pour un labyrinthe de width cellules de large
+        """
+        self.path         = path
+        self.visited      = visited
+        self.predecessors = predecessors
+        self.width        = width
+
+    @property
+    def found(self) -> bool:
+        """
+        Indique si un chemin a été trouvé
+        """
+        return self.path is not None
+
+    def __bool__(self) -> bool:
+        return self.found
+
+    def __iter__(self):
+        return iter(self.path or ())
+
+    def __len__(self) -> int:
+        return len(self.path) if self.path is not None else 0
+
+    def __repr__(self) -> str:
+        return f"SolveResult(path={self.path!r}, visited={self.visited})"
+
+    def path_to(self, cell: tuple):
+        """
+        Remonte l'arbre de parcours depuis cell jusqu'au départ.
+        Retourne la liste des cellules du départ à cell, ou None si cell n'a pas été atteinte.
+        """
+        width = self.width
+        predecessors = self.predecessors
+        k = cell[0]*width + cell[1]
+        if isinstance(predecessors, dict):
+            if k not in predecessors:
+                return None
+        elif predecessors[k] < 0:
+            return None
+
+        path = [cell]
+        while predecessors[k] != k:
+            k = predecessors[k]
+            path.append(divmod(k, width))
+        path.reverse()
+        return path
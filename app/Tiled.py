@@ -0,0 +1,109 @@
+# Génération d'un grand labyrinthe par tuiles indépendantes, réparties sur plusieurs processus.
+# Chaque tuile est un labyrinthe parfait produit par le noyau (Generators) d'un générateur de Maze ;
+# les tuiles écrivent leurs murs directement dans un tampon de mémoire partagée
+# (pas de sérialisation des labyrinthes entre processus), puis on les relie
+# en cassant un mur par arête d'un arbre couvrant des tuiles.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from random import Random
+
+from app import Generators
+from app.GridIndex import GridIndex
+from app.Maze import EAST, SOUTH, Maze
+
+
+def tiles(height: int, width: int, tile: int) -> list:
+    """
+    Découpe la grille en tuiles et retourne la liste des (haut, gauche, hauteur, largeur),
+    ligne de tuiles par ligne de tuiles
+    """
+    return [(top, left, min(tile, height - top), min(tile, width - left))
+            for top in range(0, height, tile)
+            for left in range(0, width, tile)]
+
+
+def fill_tile(buffer, width: int, algorithm: str, area: tuple, seed: int) -> None:
+    """
+    Génère une tuile avec le noyau de algorithm, tiré depuis un random.Random initialisé par seed,
+    et recopie ses murs dans buffer, le stockage de cellules du labyrinthe complet (de largeur width)
+    """
+    top, left, tile_height, tile_width = area
+    cells = Generators.KERNELS[algorithm](GridIndex.of(tile_height, tile_width), Random(seed))
+    for r in range(tile_height):
+        start = (top + r)*width + left
+        buffer[start:start + tile_width] = cells[r*tile_width:(r+1)*tile_width]
+
+
+def _fill_shared_tile(name: str, width: int, algorithm: str, area: tuple, seed: int) -> None:
+    """
+    Point d'entrée des processus : s'attache au tampon partagé name et y génère une tuile
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        fill_tile(shm.buf, width, algorithm, area, seed)
+    finally:
+        shm.close()
+
+
+def generate(cls, height: int, width: int, algorithm: str, tile: int, workers: int, rng) -> Maze:
+    """
+    Génère un labyrinthe parfait (instance de cls) de height x width cellules
+    par tuiles de tile x tile cellules (voir Maze.gen_tiled).
+    rng fournit la graine de chaque tuile et les tirages de la jonction :
+    le résultat ne dépend pas du nombre de processus.
+    """
+    assert algorithm in Generators.KERNELS, \
+        f"Erreur lors de la génération par tuiles : {algorithm} n'est pas un générateur de Maze"
+    laby = cls(height, width)
+    areas = tiles(height, width, tile)
+    seeds = [rng.getrandbits(64) for _ in areas]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(areas) == 1:
+        buffer = memoryview(laby._cells)
+        for area, seed in zip(areas, seeds):
+            fill_tile(buffer, width, algorithm, area, seed)
+        buffer.release()
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, height*width))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                jobs = [pool.submit(_fill_shared_tile, shm.name, width, algorithm, area, seed)
+                        for area, seed in zip(areas, seeds)]
+                for job in jobs:
+                    job.result()
+            laby._cells[:] = shm.buf[:height*width]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    _join_tiles(laby, tile, rng)
+    return laby
+
+
+def _join_tiles(laby: Maze, tile: int, rng) -> None:
+    """
+    Relie les tuiles : on génère un labyrinthe parfait dont chaque cellule est une tuile,
+    et pour chacun de ses passages on casse un mur choisi au hasard sur la frontière
+    des deux tuiles correspondantes. Le résultat reste un labyrinthe parfait.
+    """
+    height, width = laby.height, laby.width
+    rows = (height + tile - 1) // tile
+    cols = (width + tile - 1) // tile
+    plan = Maze.gen_fusion(rows, cols, rng=rng)
+    cells = laby._cells
+
+    for r in range(rows):
+        for c in range(cols):
+            bits = plan._cells[r*cols + c]
+            top, left = r*tile, c*tile
+            if bits & EAST:
+                # Frontière verticale : dernière colonne de la tuile (r, c)
+                i = top + rng.randrange(min(tile, height - top))
+                cells[i*width + left + tile - 1] |= EAST
+            if bits & SOUTH:
+                # Frontière horizontale : dernière ligne de la tuile (r, c)
+                j = left + rng.randrange(min(tile, width - left))
+                cells[(top + tile - 1)*width + j] |= SOUTH
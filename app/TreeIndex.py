@@ -0,0 +1,128 @@
+from array import array
+
+
+class TreeIndex:
+    """
+    Classe Index d'arbre
+    Index des plus proches ancêtres communs (LCA) d'un labyrinthe parfait,
+    c'est-à-dire dont le graphe des passages est un arbre couvrant.
+    On enracine l'arbre en une cellule, on le parcourt en profondeur
+    (tour eulérien) et on range le tour dans un arbre de segments qui
+    retient, pour chaque intervalle, la cellule la moins profonde.
+    Construction en O(n), chaque requête de distance en O(log n).
+    Toutes les cellules sont désignées par leur cell_id.
+    """
+    def __init__(self, maze, root: int = 0):
+        """
+        Constructeur de l'index du labyrinthe parfait maze, enraciné en la cellule root
+        """
+        n = maze.height*maze.width
+        self.width   = maze.width
+        self.root    = root
+        self.parents = array('l', [-1]) * n
+        self.depths  = array('l', [0]) * n
+        # Position de la première apparition de chaque cellule dans le tour eulérien
+        self.first   = array('l', [0]) * n
+
+        tour = array('l')
+        parents = self.parents
+        depths = self.depths
+        first = self.first
+
+        # Parcours en profondeur itératif : chaque entrée de pile est (cellule, voisines restantes).
+        # Une voisine déjà visitée, autre que le parent, ferme un cycle : le labyrinthe
+        # n'est pas un arbre (acyclic vaut alors False) et on ne la reparcourt pas.
+        self.acyclic = True
+        visited = bytearray(n)
+        visited[root] = 1
+        parents[root] = root
+        first[root] = 0
+        tour.append(root)
+        stack = [(root, maze._open_neighbors(root))]
+        while stack:
+            cell, todo = stack[-1]
+            while todo and todo[-1] == parents[cell]:
+                todo.pop()
+            if todo:
+                child = todo.pop()
+                if visited[child]:
+                    self.acyclic = False
+                    continue
+                visited[child] = 1
+                parents[child] = cell
+                depths[child] = depths[cell] + 1
+                first[child] = len(tour)
+                tour.append(child)
+                stack.append((child, maze._open_neighbors(child)))
+            else:
+                stack.pop()
+                if stack:
+                    tour.append(stack[-1][0])
+
+        self.size = len(tour)
+        # Arbre de segments : les feuilles sont les cellules du tour,
+        # chaque noeud interne garde la moins profonde de ses deux fils
+        size = self.size
+        segments = array('l', [0]) * size + tour
+        for p in range(size-1, 0, -1):
+            a = segments[2*p]
+            b = segments[2*p+1]
+            segments[p] = a if depths[a] <= depths[b] else b
+        self.segments = segments
+
+    def lca(self, a: int, b: int) -> int:
+        """
+        Retourne le plus proche ancêtre commun des cellules a et b
+        """
+        lo = self.first[a]
+        hi = self.first[b]
+        if lo > hi:
+            lo, hi = hi, lo
+
+        depths = self.depths
+        segments = self.segments
+        best = segments[lo + self.size]
+        lo += self.size
+        hi += self.size + 1
+        while lo < hi:
+            if lo & 1:
+                c = segments[lo]
+                if depths[c] < depths[best]:
+                    best = c
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                c = segments[hi]
+                if depths[c] < depths[best]:
+                    best = c
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def distance(self, a: int, b: int) -> int:
+        """
+        Retourne la longueur du chemin entre les cellules a et b
+        """
+        depths = self.depths
+        return depths[a] + depths[b] - 2*depths[self.lca(a, b)]
+
+    def path(self, a: int, b: int) -> list:
+        """
+        Retourne la liste des cellules (l,c) du chemin de a vers b
+        """
+        ancestor = self.lca(a, b)
+        parents = self.parents
+        width = self.width
+
+        up = []
+        while a != ancestor:
+            up.append(divmod(a, width))
+            a = parents[a]
+        up.append(divmod(ancestor, width))
+
+        down = []
+        while b != ancestor:
+            down.append(divmod(b, width))
+            b = parents[b]
+        down.reverse()
+        return up + down
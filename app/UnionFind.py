@@ -0,0 +1,63 @@
+from array import array
+
+
+class UnionFind:
+    """
+    Classe Union-Find (ensembles disjoints)
+    Les éléments sont les entiers de 0 à size-1 (par exemple les indices
+    des cellules d'un labyrinthe). La structure est stockée dans deux
+    tableaux plats :
+      - parents : parent de chaque élément (un élément racine est son propre parent)
+      - ranks : majorant de la hauteur de l'arbre enraciné en chaque élément
+    Avec la compression de chemin et l'union par rang, chaque opération
+    coûte O(α(n)) en amorti.
+    """
+    def __init__(self, size: int):
+        """
+        Constructeur d'une structure de size éléments, chacun dans son propre ensemble
+        """
+        self.parents = array('l', range(size))
+        # Le rang ne dépasse jamais log2(size), un octet suffit
+        self.ranks   = bytearray(size)
+        self.count   = size
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def find(self, x: int) -> int:
+        """
+        Retourne le représentant de l'ensemble contenant x,
+        en raccrochant directement à la racine tous les éléments du chemin parcouru.
+        """
+        parents = self.parents
+        root = x
+        while parents[root] != root:
+            root = parents[root]
+        while parents[x] != root:
+            parents[x], x = root, parents[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Fusionne les ensembles contenant a et b.
+        Retourne False si a et b étaient déjà dans le même ensemble, True sinon.
+        """
+        ra = self.find(a)
+        rb = self.find(b)
+        if ra == rb:
+            return False
+
+        ranks = self.ranks
+        if ranks[ra] < ranks[rb]:
+            ra, rb = rb, ra
+        self.parents[rb] = ra
+        if ranks[ra] == ranks[rb]:
+            ranks[ra] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        """
+        Indique si a et b appartiennent au même ensemble
+        """
+        return self.find(a) == self.find(b)
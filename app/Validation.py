@@ -0,0 +1,158 @@
+# Vérifications structurelles d'un labyrinthe, chacune en un passage sur les cellules.
+# Les résultats sont des dictionnaires (jamais de chaînes de rendu) : les fonctions
+# peuvent être appelées sur chaque labyrinthe produit sans dominer le temps de génération.
+# Les cellules sont désignées par leur cell_id (l*width + c).
+from array import array
+
+from app.Maze import EAST, SOUTH
+from app.UnionFind import UnionFind
+
+# Octets contenant d'autres bits que EAST et SOUTH
+_BAD_BITS = bytes(b & ~(EAST | SOUTH) != 0 for b in range(256))
+_HAS_EAST = bytes(b & EAST != 0 for b in range(256))
+_HAS_SOUTH = bytes(b & SOUTH != 0 for b in range(256))
+
+
+def _cells(maze) -> bytes:
+    """
+    Retourne le stockage des cellules sous forme d'octets (copie des cellules d'un fichier projeté)
+    """
+    cells = maze._cells
+    return cells if isinstance(cells, (bytes, bytearray)) else cells[:]
+
+
+def _first(flags: bytes, k: int, step: int = 1):
+    """
+    Retourne le cell_id de la première cellule marquée dans flags (lus depuis la cellule k,
+    de step en step), ou None
+    """
+    p = flags.find(1)
+    return None if p < 0 else k + p*step
+
+
+def coherence(maze) -> dict:
+    """
+    Cohérence du stockage : une cellule par case de la grille et, dans chaque cellule,
+    uniquement les bits de passage EAST et SOUTH. Un passage étant rangé une seule fois
+    (dans la cellule du haut ou de gauche), les voisinages sont alors symétriques.
+    Retourne {"ok", "cells" (nombre de cellules stockées), "bad_bits", "first"}.
+    """
+    cells = _cells(maze)
+    flags = cells.translate(_BAD_BITS)
+    bad = flags.count(1)
+    ok = len(cells) == maze.height*maze.width and not bad
+    return {"ok": ok, "cells": len(cells), "bad_bits": bad, "first": _first(flags, 0)}
+
+
+def orthogonal(maze) -> dict:
+    """
+    Adjacence orthogonale : aucun passage ne sort de la grille. Un passage est
+    de la dernière colonne relierait la cellule au début de la ligne suivante,
+    un passage sud de la dernière ligne à une cellule inexistante.
+    Retourne {"ok", "east_border", "south_border" (nombres de passages fautifs), "first"}.
+    """
+    height, width = maze.height, maze.width
+    cells = _cells(maze)
+    if height == 0 or width == 0:
+        return {"ok": True, "east_border": 0, "south_border": 0, "first": None}
+
+    east = cells[width-1::width].translate(_HAS_EAST)
+    south = cells[(height-1)*width:].translate(_HAS_SOUTH)
+    firsts = [k for k in (_first(east, width-1, width), _first(south, (height-1)*width)) if k is not None]
+    return {
+        "ok": not east.count(1) and not south.count(1),
+        "east_border": east.count(1),
+        "south_border": south.count(1),
+        "first": min(firsts) if firsts else None,
+    }
+
+
+def _scan(maze) -> tuple:
+    """
+    Un passage sur les passages intérieurs de la grille (ceux qui en sortent sont ignorés) :
+    retourne (Union-Find des composantes, nombre de passages, premier passage fermant un cycle)
+    où un passage est le couple de cell_id (k, k+1) ou (k, k+width)
+    """
+    height, width = maze.height, maze.width
+    uf = UnionFind(height*width)
+    union = uf.union
+    passages = 0
+    closing = None
+    last_row = (height-1)*width
+    for k, bits in enumerate(_cells(maze)):
+        if not bits:
+            continue
+        if bits & EAST and (k+1) % width:
+            passages += 1
+            if not union(k, k+1) and closing is None:
+                closing = (k, k+1)
+        if bits & SOUTH and k < last_row:
+            passages += 1
+            if not union(k, k+width) and closing is None:
+                closing = (k, k+width)
+    return uf, passages, closing
+
+
+def components(maze, uf: UnionFind = None) -> dict:
+    """
+    Composantes connexes : leur nombre, leur taille et le numéro de composante de chaque
+    cellule (tableau indexé par cell_id, composantes numérotées dans l'ordre des cellules).
+    Retourne {"count", "sizes", "labels"}.
+    """
+    if uf is None:
+        uf = _scan(maze)[0]
+    find = uf.find
+    labels = array('l', [0]) * len(uf)
+    numbers = {}
+    sizes = []
+    for k in range(len(uf)):
+        root = find(k)
+        label = numbers.get(root)
+        if label is None:
+            label = numbers[root] = len(sizes)
+            sizes.append(0)
+        labels[k] = label
+        sizes[label] += 1
+    return {"count": uf.count, "sizes": sizes, "labels": labels}
+
+
+def cycles(maze) -> dict:
+    """
+    Cycles : le nombre cyclomatique (passages en trop par rapport à une forêt couvrante,
+    0 si et seulement si le labyrinthe n'a aucun cycle) et un passage fermant un cycle.
+    Retourne {"count", "passages", "closing" (couple de cell_id ou None)}.
+    """
+    uf, passages, closing = _scan(maze)
+    return {"count": passages - (len(uf) - uf.count), "passages": passages, "closing": closing}
+
+
+def is_perfect(maze) -> bool:
+    """
+    Indique si le labyrinthe est parfait : stockage cohérent, passages orthogonaux,
+    une seule composante et aucun cycle (chaque couple de cellules relié par un unique chemin)
+    """
+    if not coherence(maze)["ok"] or not orthogonal(maze)["ok"]:
+        return False
+    # Rejet immédiat sur le nombre de passages, compté sans boucle Python
+    cells = _cells(maze)
+    if cells.translate(_HAS_EAST).count(1) + cells.translate(_HAS_SOUTH).count(1) != len(cells) - 1:
+        return False
+    uf, passages, _ = _scan(maze)
+    return len(uf) > 0 and uf.count == 1 and passages == len(uf) - 1
+
+
+def validate(maze) -> dict:
+    """
+    Toutes les vérifications en une fois, le parcours des passages étant partagé.
+    Retourne {"coherence", "orthogonal", "components", "cycles", "perfect"}.
+    """
+    uf, passages, closing = _scan(maze)
+    report = {
+        "coherence": coherence(maze),
+        "orthogonal": orthogonal(maze),
+        "components": components(maze, uf),
+        "cycles": {"count": passages - (len(uf) - uf.count), "passages": passages, "closing": closing},
+    }
+    report["perfect"] = (report["coherence"]["ok"] and report["orthogonal"]["ok"]
+                         and len(uf) > 0 and uf.count == 1 and report["cycles"]["count"] == 0)
+    return report
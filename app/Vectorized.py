@@ -0,0 +1,113 @@
+# Génération vectorisée des labyrinthes dont les tirages sont indépendants
+# (arbre binaire, sidewinder). NumPy est une dépendance facultative : le module
+# s'importe sans elle, mais ses fonctions lèvent alors ImportError.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.Maze import EAST, SOUTH
+
+
+def require_numpy() -> None:
+    """
+    Vérifie que NumPy est installé
+    """
+    if np is None:
+        raise ImportError("La génération vectorisée nécessite NumPy (pip install numpy)")
+
+
+def _generator(seed=None, rng=None):
+    """
+    Retourne le générateur NumPy à utiliser : rng s'il est fourni, sinon un générateur initialisé par seed
+    """
+    require_numpy()
+    return rng if rng is not None else np.random.default_rng(seed)
+
+
+def _coins(rng, shape: tuple):
+    """
+    Tire un tableau booléen de pile ou face de la forme shape,
+    à partir d'octets aléatoires dépliés bit par bit (8 pièces par octet tiré)
+    """
+    count = 1
+    for size in shape:
+        count *= size
+    data = np.frombuffer(rng.bytes((count + 7) // 8), dtype=np.uint8)
+    return np.unpackbits(data, count=count).view(bool).reshape(shape)
+
+
+def btree_arrays(height: int, width: int, seed=None, rng=None) -> tuple:
+    """
+    Génère un labyrinthe par arbre binaire en un seul tirage de height x width pièces.
+    Retourne le couple (east, south) de tableaux booléens height x width :
+    east[i, j] (resp. south[i, j]) vaut True si le mur à l'est (resp. au sud) de la cellule (i, j) est cassé.
+    """
+    rng = _generator(seed, rng)
+    # True : on préfère casser le mur au sud, False : le mur à l'est
+    coins = _coins(rng, (height, width))
+    has_south = (np.arange(height) < height-1)[:, None]
+    has_east = (np.arange(width) < width-1)[None, :]
+
+    # Sur la dernière ligne (resp. colonne), on se rabat sur l'autre direction
+    south = has_south & (coins | ~has_east)
+    east = has_east & (~coins | ~has_south)
+    return east, south
+
+
+def sidewinder_arrays(height: int, width: int, seed=None, rng=None) -> tuple:
+    """
+    Génère un labyrinthe par l'algorithme sidewinder, toutes lignes à la fois.
+    Une pièce par cellule (hors dernière colonne) décide de fermer la séquence courante ;
+    les bornes des séquences se déduisent des positions des fermetures, et un seul tirage
+    uniforme par séquence choisit la cellule dont on casse le mur au sud.
+    Retourne le couple (east, south) décrit dans btree_arrays.
+    """
+    rng = _generator(seed, rng)
+    east = np.zeros((height, width), dtype=bool)
+    south = np.zeros((height, width), dtype=bool)
+    if height == 0 or width == 0:
+        return east, south
+
+    rows = height-1
+    if rows:
+        closes = np.ones((rows, width), dtype=bool)
+        closes[:, :-1] = _coins(rng, (rows, width-1))
+        # Tant que la séquence continue, on casse le mur à l'est
+        east[:rows, :-1] = ~closes[:, :-1]
+
+        # Une séquence se termine sur chaque fermeture (la dernière colonne ferme toujours),
+        # sa longueur est l'écart avec la fermeture précédente
+        index = np.int32 if height*width < 2**31 else np.int64
+        ends = np.flatnonzero(closes.ravel()).astype(index)
+        lengths = np.diff(ends, prepend=index(-1))
+        starts = ends - lengths + 1
+
+        # Tirage en simple précision : on borne le résultat pour écarter tout arrondi à lengths
+        picks = (rng.random(len(lengths), dtype=np.float32) * lengths.astype(np.float32)).astype(index)
+        np.minimum(picks, lengths - 1, out=picks)
+        picks += starts
+        south.ravel()[picks] = True
+
+    # On casse tous les murs à l'est de la dernière ligne
+    east[-1, :-1] = True
+    return east, south
+
+
+def to_cells(east, south) -> bytearray:
+    """
+    Convertit les tableaux (east, south) en stockage de cellules de Maze (un octet par cellule)
+    """
+    require_numpy()
+    east = np.ascontiguousarray(east, dtype=bool).view(np.uint8)
+    south = np.ascontiguousarray(south, dtype=bool).view(np.uint8)
+    return bytearray(east * EAST | south * SOUTH)
+
+
+def from_cells(cells, height: int, width: int) -> tuple:
+    """
+    Opération inverse de to_cells : retourne les tableaux (east, south) d'un stockage de cellules
+    """
+    require_numpy()
+    grid = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(height, width)
+    return (grid & EAST).astype(bool), (grid & SOUTH).astype(bool)
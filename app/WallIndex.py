@@ -0,0 +1,58 @@
+from array import array
+
+
+class WallIndex:
+    """
+    Classe Index de murs
+    Ensemble des murs présents d'un labyrinthe, codés comme Maze._wall_codes
+    (2*k pour le mur à l'est de la cellule k, 2*k+1 pour le mur au sud de k).
+    Les codes sont rangés dans un tableau dense, et positions donne la place
+    de chaque code dans ce tableau (-1 si le mur est absent) : le test,
+    l'ajout, le retrait (par échange avec le dernier) et le tirage uniforme
+    d'un mur coûtent O(1). L'ordre du tableau n'est pas celui de get_walls.
+    """
+    def __init__(self, size: int, codes):
+        """
+        Constructeur de l'index d'un labyrinthe de size cellules, contenant les murs codes
+        """
+        self.codes     = array('l', codes)
+        self.positions = array('l', [-1]) * (2*size)
+        positions = self.positions
+        for p, code in enumerate(self.codes):
+            positions[code] = p
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: int) -> bool:
+        return self.positions[code] >= 0
+
+    def add(self, code: int) -> None:
+        """
+        Ajoute le mur code (sans effet s'il est déjà présent)
+        """
+        if self.positions[code] < 0:
+            self.positions[code] = len(self.codes)
+            self.codes.append(code)
+
+    def discard(self, code: int) -> None:
+        """
+        Retire le mur code (sans effet s'il est absent) : le dernier mur du tableau prend sa place
+        """
+        codes = self.codes
+        positions = self.positions
+        p = positions[code]
+        if p < 0:
+            return
+        last = codes.pop()
+        if last != code:
+            codes[p] = last
+            positions[last] = p
+        positions[code] = -1
+
+    def sample(self, rng) -> int:
+        """
+        Retourne un mur tiré uniformément avec le générateur rng (Random ou module random)
+        """
+        assert self.codes, "Erreur lors du tirage d'un mur : le labyrinthe n'a aucun mur"
+        return self.codes[rng.randrange(len(self.codes))]
@@ -0,0 +1,474 @@
+"""
+Mesures de performances des algorithmes du labyrinthe.
+
+Usage :
+    python bench.py                  # toutes les séries de mesures
+    python bench.py linear           # une série précise
+    python bench.py linear --max-size 1000
+    python bench.py ladder --json mesures.json
+    python bench.py ladder --baseline mesures.json --threshold 0.25
+
+Les séries ladder et alloc produisent des enregistrements que --json écrit
+dans un fichier ; --baseline compare ces enregistrements à ceux d'un fichier
+précédent et termine en erreur (code 1) si l'un d'eux régresse au-delà du seuil.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.Maze import Maze
+
+
+def timed(func, *args, **kwargs):
+    """
+    Exécute func et retourne le couple (résultat, durée en secondes)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def size_ladder(max_size: int, start: int = 250) -> list:
+    """
+    Tailles de côté doublées à chaque étape jusqu'à max_size
+    """
+    sizes = []
+    size = start
+    while size <= max_size:
+        sizes.append(size)
+        size *= 2
+    return sizes
+
+
+def bench_linear(args):
+    """
+    Vérifie que l'arbre binaire et sidewinder passent à l'échelle linéairement :
+    le temps par cellule doit rester stable quand la taille quadruple.
+    """
+    print("== Générateurs linéaires ==")
+    for name in ("gen_btree", "gen_sidewinder"):
+        for size in size_ladder(args.max_size):
+            random.seed(0)
+            _, elapsed = timed(getattr(Maze, name), size, size)
+            cells = size*size
+            print(f"{name:16} {size:>5}x{size:<5} {elapsed:8.3f} s  {elapsed/cells*1e9:7.1f} ns/cellule")
+
+
+def bench_perfect(args):
+    """
+    Générateurs de labyrinthes parfaits (fusion, exploration, Wilson) :
+    temps par cellule et vérification que le résultat est bien un arbre couvrant.
+    """
+    print("== Générateurs parfaits ==")
+    for name in ("gen_fusion", "gen_exploration", "gen_wilson", "gen_eller", "gen_prim"):
+        for size in size_ladder(min(args.max_size, 1000)):
+            random.seed(0)
+            laby, elapsed = timed(getattr(Maze, name), size, size)
+            cells = size*size
+            perfect = laby.connectivity().count == 1 and len(laby.get_walls()) == 2*size*(size-1) - (cells-1)
+            print(f"{name:16} {size:>5}x{size:<5} {elapsed:8.3f} s  {elapsed/cells*1e9:7.1f} ns/cellule  {'parfait' if perfect else 'NON PARFAIT'}")
+
+
+def bench_numpy(args):
+    """
+    Compare les générateurs vectorisés (NumPy) aux générateurs en Python pur
+    """
+    print("== Générateurs vectorisés ==")
+    from app import Vectorized
+    if Vectorized.np is None:
+        print("NumPy n'est pas installé : série ignorée")
+        return
+
+    for name in ("btree", "sidewinder"):
+        # La voie vectorisée monte jusqu'à 10000x10000, la voie Python s'arrête à --max-size
+        for size in size_ladder(8000) + [10000]:
+            _, vectorized = timed(getattr(Maze, f"gen_{name}_numpy"), size, size, seed=0)
+            line = f"{name:16} {size:>5}x{size:<5} numpy {vectorized:8.3f} s"
+            if size <= args.max_size:
+                random.seed(0)
+                _, pure = timed(getattr(Maze, f"gen_{name}"), size, size)
+                line += f"  python {pure:8.3f} s  x{pure/vectorized:6.1f}"
+            print(line)
+
+
+def bench_stream(args):
+    """
+    Eller en flux vers un fichier : le pic de mémoire doit rester constant quand la hauteur décuple
+    """
+    print("== Eller en flux (largeur 100) ==")
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        # Premier appel hors mesure : l'import des noyaux ne compte pas dans le pic
+        Maze.stream_eller(devnull, 1, 100, seed=0)
+        for height in (1000, 10000, 30000):
+            start = time.perf_counter()
+            _, peak = traced(Maze.stream_eller, devnull, height, 100, seed=0)
+            elapsed = time.perf_counter() - start
+            print(f"stream_eller     {height:>7}x100   {elapsed:8.3f} s (tracé)  pic {peak/1024:8.1f} Kio")
+
+
+def bench_tiled(args):
+    """
+    Génération par tuiles : débit en cellules par seconde selon le nombre de processus
+    """
+    print("== Génération par tuiles ==")
+    size = min(args.max_size, 2000)
+    counts = sorted({1, 2, os.cpu_count() or 1})
+    for name in ("gen_exploration", "gen_wilson", "gen_fusion"):
+        for workers in counts:
+            random.seed(0)
+            _, elapsed = timed(Maze.gen_tiled, size, size, name, tile=250, workers=workers)
+            print(f"{name:16} {size:>5}x{size:<5} {workers:>3} processus {elapsed:8.3f} s  {size*size/elapsed/1e6:6.2f} M cellules/s")
+
+
+def bench_batch(args):
+    """
+    Génération en série de petits labyrinthes : débit en labyrinthes par seconde
+    """
+    print("== Génération en série (20x30) ==")
+    count = 2000
+    for name in ("gen_btree", "gen_sidewinder", "gen_fusion", "gen_exploration", "gen_wilson"):
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            for _ in Maze.generate_batch(count, 20, 30, name, seed=0, workers=workers):
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"{name:16} {workers:>3} processus {count/elapsed:10.0f} labyrinthes/s")
+
+
+def braided(size: int, ratio: float = 0.1) -> Maze:
+    """
+    Labyrinthe d'exploration dont on casse une fraction des murs restants pour créer des boucles
+    """
+    laby = Maze.gen_exploration(size, size)
+    walls = laby.get_walls()
+    random.shuffle(walls)
+    for c1, c2 in walls[:int(len(walls)*ratio)]:
+        laby.remove_wall(c1, c2)
+    return laby
+
+
+def bench_solvers(args):
+    """
+    Requêtes point à point sur un labyrinthe avec boucles : temps moyen et nombre
+    moyen de cellules développées par chaque solveur, comparés au parcours en largeur.
+    """
+    print("== Solveurs point à point ==")
+    solvers = ("solve_bfs", "solve_dfs", "solve_astar", "solve_bidirectional")
+    for size in size_ladder(min(args.max_size, 1000)):
+        random.seed(0)
+        laby = braided(size)
+        pairs = [((random.randrange(size), random.randrange(size)), (random.randrange(size), random.randrange(size))) for _ in range(20)]
+        reference = None
+        for name in solvers:
+            expanded = 0
+            start = time.perf_counter()
+            for c1, c2 in pairs:
+                expanded += getattr(laby, name)(c1, c2).visited
+            elapsed = (time.perf_counter() - start) / len(pairs)
+            expanded /= len(pairs)
+            reference = reference or expanded
+            print(f"{name:20} {size:>5}x{size:<5} {elapsed*1000:9.2f} ms/requête  {expanded:10.0f} cellules développées ({expanded/reference:6.1%} du BFS)")
+
+
+def traced(func, *args, **kwargs):
+    """
+    Exécute func sous tracemalloc et retourne le couple (résultat, pic de mémoire allouée en octets)
+    """
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_alloc(args):
+    """
+    Pic de mémoire allouée par les boucles chaudes. CPython ne compte pas les
+    allocations passagères : le pic tracé par tracemalloc en tient lieu.
+    Les tables d'adjacence de la forme sont construites avant la mesure.
+    """
+    print("== Allocations des boucles chaudes ==")
+    size = min(args.max_size, 300)
+    Maze(size, size).index.mask
+    random.seed(0)
+    laby = braided(size)
+    perfect = Maze.gen_exploration(size, size, seed=0)
+    corner = (size-1, size-1)
+    cases = (
+        ("gen_exploration", lambda: Maze.gen_exploration(size, size)),
+        ("gen_exploration seed", lambda: Maze.gen_exploration(size, size, seed=1)),
+        ("gen_wilson seed", lambda: Maze.gen_wilson(size, size, seed=1)),
+        ("gen_fusion seed", lambda: Maze.gen_fusion(size, size, seed=1)),
+        ("solve_bfs", lambda: laby.solve_bfs((0, 0), corner)),
+        ("solve_astar", lambda: laby.solve_astar((0, 0), corner)),
+        ("solve_bidirectional", lambda: laby.solve_bidirectional((0, 0), corner)),
+        ("tree_index", lambda: perfect.tree_index()),
+    )
+    records = []
+    for name, func in cases:
+        random.seed(0)
+        _, peak = traced(func)
+        print(f"{name:20} {size:>5}x{size:<5} pic {peak/1024:10.1f} Kio")
+        records.append({"suite": "alloc", "name": name, "size": size, "peak_kib": round(peak/1024, 1)})
+    return records
+
+
+# Côté maximal raisonnable de chaque opération de la série ladder
+LADDER = (10, 50, 100, 250, 500, 1000, 2000)
+LADDER_LIMITS = {
+    "gen_exploration": 1000,
+    "gen_wilson": 1000,
+    "gen_prim": 1000,
+    "get_walls": 1000,
+}
+
+
+def measure(func, repeat: int = 1) -> dict:
+    """
+    Mesure func : meilleure durée sur repeat exécutions (sans traçage), puis, lors d'une
+    exécution tracée, pic de mémoire allouée et nombre de blocs mémoire encore alloués
+    à la fin de l'appel (objets créés par l'appel et retenus par son résultat)
+    """
+    seconds = min(timed(func)[1] for _ in range(repeat))
+    tracemalloc.start()
+    try:
+        before = sys.getallocatedblocks()
+        result = func()
+        blocks = sys.getallocatedblocks() - before
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"seconds": round(seconds, 6), "peak_kib": round(peak/1024, 1), "blocks": blocks}
+
+
+# Suffixe des mesures de la série ladder faites sans seed
+UNSEEDED = ":random"
+
+
+def unseeded(name: str, size: int):
+    """
+    Appelle le générateur name sans seed, après random.seed(0) pour que les mesures soient répétables
+    """
+    random.seed(0)
+    if name == "gen_tiled":
+        return Maze.gen_tiled(size, size, workers=1)
+    return getattr(Maze, name)(size, size)
+
+
+def ladder_cases(size: int):
+    """
+    Opérations mesurées par la série ladder pour un côté donné, sous forme de couples (nom, fonction)
+    """
+    from app import Vectorized
+    corner = (size-1, size-1)
+    for name in sorted(attr for attr in dir(Maze) if attr.startswith("gen_")):
+        if name.endswith("_numpy") and Vectorized.np is None:
+            continue
+        if name == "gen_tiled":
+            yield name, lambda: Maze.gen_tiled(size, size, seed=0, workers=1)
+        else:
+            yield name, lambda name=name: getattr(Maze, name)(size, size, seed=0)
+    # Sans seed, les générateurs tirent dans le module random (chemin par défaut de tests.py
+    # et de la plupart des appelants) ; les versions NumPy tirent dans numpy.random
+    for name in sorted(attr for attr in dir(Maze) if attr.startswith("gen_") and not attr.endswith("_numpy")):
+        yield name + UNSEEDED, lambda name=name: unseeded(name, size)
+
+    laby = Maze.gen_exploration(size, size, seed=0)
+    path = laby.solve_bfs((0, 0), corner).path
+    content = dict.fromkeys(path, "*")
+    yield "solve_bfs", lambda: laby.solve_bfs((0, 0), corner)
+    yield "solve_dfs", lambda: laby.solve_dfs((0, 0), corner)
+    yield "get_walls", laby.get_walls
+    yield "__str__", laby.__str__
+    yield "overlay", lambda: laby.overlay(content)
+
+
+def bench_ladder(args):
+    """
+    Toutes les méthodes de génération (avec et sans seed), les solveurs BFS/DFS, get_walls
+    et le rendu texte sur une échelle de tailles : durée, pic de mémoire et blocs alloués
+    de chaque opération
+    """
+    print("== Échelle de tailles ==")
+    records = []
+    for size in LADDER:
+        if size > args.max_size:
+            break
+        for name, func in ladder_cases(size):
+            if size > LADDER_LIMITS.get(name.removesuffix(UNSEEDED), size):
+                continue
+            record = {"suite": "ladder", "name": name, "size": size}
+            record.update(measure(func, args.repeat))
+            records.append(record)
+            print(f"{name:22} {size:>5}x{size:<5} {record['seconds']:9.4f} s  pic {record['peak_kib']:10.1f} Kio  {record['blocks']:>9} blocs")
+    return records
+
+
+# En deçà de ces écarts absolus, une différence est attribuée au bruit de mesure
+NOISE = {"seconds": 0.02, "peak_kib": 64}
+# Durées de référence trop courtes pour être comparées de façon fiable (ordonnanceur, caches)
+MIN_SECONDS = 0.05
+
+
+def compare(records: list, baseline: list, threshold: float) -> list:
+    """
+    Compare les enregistrements à ceux d'une mesure de référence (mêmes série, nom et taille).
+    Les durées ne sont comparées que si la référence dure au moins MIN_SECONDS.
+    Retourne la liste des régressions : (enregistrement, métrique, référence, mesure)
+    """
+    reference = {(r["suite"], r["name"], r["size"]): r for r in baseline}
+    regressions = []
+    for record in records:
+        base = reference.get((record["suite"], record["name"], record["size"]))
+        if base is None:
+            continue
+        for metric, noise in NOISE.items():
+            if metric in record and metric in base:
+                old, new = base[metric], record[metric]
+                if metric == "seconds" and old < MIN_SECONDS:
+                    continue
+                if new > old*(1 + threshold) and new - old > noise:
+                    regressions.append((record, metric, old, new))
+    return regressions
+
+
+def bench_junctions(args):
+    """
+    Graphe des carrefours sur des labyrinthes parfaits : coût de construction, part de
+    cellules de couloir, et requêtes comparées au parcours en largeur sur les cellules
+    """
+    print("== Graphe des carrefours ==")
+    for name in ("gen_exploration", "gen_wilson"):
+        for size in size_ladder(min(args.max_size, 1000)):
+            laby = getattr(Maze, name)(size, size, seed=0)
+            graph, build = timed(laby.junction_graph)
+            ratio = graph.stats()["corridor_ratio"]
+            print(f"{name:16} {size:>5}x{size:<5} construction {build:8.3f} s  couloirs {ratio:6.1%}")
+            rng = random.Random(0)
+            pairs = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size))) for _ in range(20)]
+            reference = None
+            for label, solve in (("solve_bfs", laby.solve_bfs), ("graphe dijkstra", graph.solve_dijkstra), ("graphe astar", graph.solve_astar)):
+                expanded = 0
+                start = time.perf_counter()
+                for c1, c2 in pairs:
+                    expanded += solve(c1, c2).visited
+                elapsed = (time.perf_counter() - start) / len(pairs)
+                expanded /= len(pairs)
+                reference = reference or expanded
+                print(f"    {label:16} {elapsed*1000:9.2f} ms/requête  {expanded:10.0f} développés ({expanded/reference:6.1%} du BFS)")
+
+
+def bench_lazy(args):
+    """
+    Labyrinthes procéduraux de 10**12 lignes : requêtes A* près de la dernière ligne
+    (vers laquelle convergent tous les chemins) et pic de mémoire, qui ne dépend pas de la hauteur
+    """
+    from app.LazyMaze import LazyMaze
+
+    print("== Labyrinthes procéduraux (10**12 lignes) ==")
+    height = 10**12
+    for algorithm in ("btree", "sidewinder"):
+        for width in (100, 1000):
+            laby = LazyMaze(height, width, algorithm, seed=0)
+            start = time.perf_counter()
+            result, peak = traced(laby.solve_astar, (height-60, 0), (height-20, width-1))
+            elapsed = time.perf_counter() - start
+            print(f"{algorithm:16} largeur {width:>5}  {elapsed:8.3f} s (tracé)  {result.visited:8} développés  pic {peak/1024:8.1f} Kio")
+
+
+def bench_quality(args):
+    """
+    Qualité des labyrinthes produits face à la vitesse de génération : part de culs-de-sac,
+    facteur de rivière, diamètre, longueur moyenne des solutions et des couloirs
+    """
+    print("== Qualité des générateurs ==")
+    for size in size_ladder(min(args.max_size, 500), 100):
+        for name in ("gen_btree", "gen_sidewinder", "gen_fusion", "gen_exploration", "gen_wilson"):
+            laby, generation = timed(getattr(Maze, name), size, size, seed=0)
+            stats, elapsed = timed(laby.metrics, rng=random.Random(0))
+            n = stats["cells"]
+            print(f"{name:16} {size:>5}x{size:<5} génération {generation:7.3f} s  mesures {elapsed:7.3f} s  "
+                  f"culs-de-sac {stats['dead_ends']/n:6.1%}  rivière {stats['river']:6.1%}  "
+                  f"diamètre {stats['diameter']:7}  chemin moyen {stats['mean_path']:9.1f}  "
+                  f"couloir moyen {stats['corridors']['mean']:5.2f}")
+
+
+def bench_image(args):
+    """
+    Export en image ligne de pixels par ligne de pixels (2 pixels par cellule), avec
+    et sans chemin tracé, et pic de mémoire qui ne dépend que de la largeur
+    """
+    print("== Export en image ==")
+    for size in size_ladder(min(args.max_size, 4000), 500):
+        laby = Maze.gen_btree(size, size, seed=0)
+        path = laby.solve_bfs((0, 0), (size-1, size-1))
+        for extension, solution in (("pbm", None), ("pgm", None), ("png", None), ("png", path)):
+            dest = os.path.join(tempfile.gettempdir(), f"bench_image.{extension}")
+            start = time.perf_counter()
+            _, peak = traced(laby.to_image, dest, 2, solution)
+            elapsed = time.perf_counter() - start
+            label = extension + (" + chemin" if solution else "")
+            print(f"{label:16} {size:>5}x{size:<5} {elapsed:8.3f} s (tracé)  {os.path.getsize(dest)/2**20:8.1f} Mio  pic {peak/1024:8.1f} Kio")
+            os.remove(dest)
+
+
+SUITES = {
+    "linear": bench_linear,
+    "perfect": bench_perfect,
+    "solvers": bench_solvers,
+    "junctions": bench_junctions,
+    "quality": bench_quality,
+    "numpy": bench_numpy,
+    "stream": bench_stream,
+    "image": bench_image,
+    "lazy": bench_lazy,
+    "tiled": bench_tiled,
+    "batch": bench_batch,
+    "alloc": bench_alloc,
+    "ladder": bench_ladder,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performances du labyrinthe")
+    parser.add_argument("suites", nargs="*", help=f"séries à lancer parmi {', '.join(SUITES)} (toutes par défaut)")
+    parser.add_argument("--max-size", type=int, default=4000, help="côté maximal des labyrinthes générés")
+    parser.add_argument("--repeat", type=int, default=3, help="nombre d'exécutions dont on garde la meilleure durée (série ladder)")
+    parser.add_argument("--json", metavar="FICHIER", help="écrit les enregistrements des mesures dans ce fichier JSON")
+    parser.add_argument("--baseline", metavar="FICHIER", help="fichier JSON de référence auquel comparer les mesures")
+    parser.add_argument("--threshold", type=float, default=0.2, help="régression tolérée par rapport à la référence (0.2 = +20%%)")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"séries inconnues : {', '.join(unknown)}")
+
+    records = []
+    for name in args.suites or SUITES:
+        records += SUITES[name](args) or []
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "records": records}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["records"]
+        regressions = compare(records, baseline, args.threshold)
+        for record, metric, old, new in regressions:
+            print(f"RÉGRESSION {record['suite']}/{record['name']} {record['size']} : {metric} {old} -> {new} (+{new/old - 1:.0%})" if old else
+                  f"RÉGRESSION {record['suite']}/{record['name']} {record['size']} : {metric} {old} -> {new}")
+        if regressions:
+            sys.exit(1)
+        print(f"Aucune régression au-delà de {args.threshold:.0%} sur {len(records)} mesures")
+
+
+if __name__ == "__main__":
+    main()
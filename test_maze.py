@@ -0,0 +1,855 @@
+"""
+Tests non interactifs du labyrinthe (l'interface tests.py reste l'outil manuel).
+
+Usage :
+    python -m pytest -q test_maze.py
+    python -m unittest test_maze
+"""
+import hashlib
+import io
+import os
+import random
+import struct
+import tempfile
+import unittest
+import zlib
+from collections import deque
+
+from app.Maze import Maze
+
+GENERATORS = ("gen_btree", "gen_sidewinder", "gen_fusion", "gen_exploration", "gen_wilson")
+
+# Empreintes (sha256 tronqué du rendu texte) des labyrinthes produits par la version
+# d'origine des générateurs après random.seed(42), sans seed ni rng
+LEGACY = {
+    ("gen_btree", 7, 9): "80514f5b8548d4ec",
+    ("gen_btree", 15, 12): "d6cff982444666d7",
+    ("gen_sidewinder", 7, 9): "a24f88b3b0e0836b",
+    ("gen_sidewinder", 15, 12): "d4a1cb1ec07e964f",
+    ("gen_fusion", 7, 9): "d108ed41d9f02e21",
+    ("gen_fusion", 15, 12): "77486b48af52c005",
+    ("gen_exploration", 7, 9): "ee7d5f1da2fe8526",
+    ("gen_exploration", 15, 12): "4698403775df3b81",
+}
+
+# gen_wilson ne figure pas dans LEGACY : l'ordre de sa marche a changé avec user-004
+# (la version d'origine donnait 3d1e498d26da1161 et 7d6781ec806321ab). Ces empreintes
+# post-user-004 fixent le tirage actuel sans seed ni rng, toujours après random.seed(42).
+POST_USER_004 = {
+    ("gen_wilson", 7, 9): "e157d342dd6952aa",
+    ("gen_wilson", 15, 12): "402aafd9e74375b7",
+}
+
+
+def fingerprint(laby: Maze) -> str:
+    """
+    Empreinte du rendu texte d'un labyrinthe
+    """
+    return hashlib.sha256(str(laby).encode()).hexdigest()[:16]
+
+
+def reference_distances(laby: Maze, start: tuple) -> dict:
+    """
+    Parcours en largeur de référence, sur la vue neighbors uniquement :
+    retourne {cellule: distance depuis start} pour les cellules accessibles
+    """
+    distances = {start: 0}
+    file = deque([start])
+    while file:
+        cell = file.popleft()
+        for voisine in laby.neighbors[cell]:
+            if voisine not in distances:
+                distances[voisine] = distances[cell] + 1
+                file.append(voisine)
+    return distances
+
+
+def braid(laby: Maze, rng, removed: int, added: int) -> Maze:
+    """
+    Supprime removed murs (cycles) puis ajoute added murs (cellules coupées) tirés avec rng
+    """
+    for _ in range(removed):
+        if laby.wall_count():
+            c1, c2 = laby.random_wall(rng)
+            laby.remove_wall(c1, c2)
+    for _ in range(added):
+        c1 = (rng.randrange(laby.height), rng.randrange(laby.width))
+        c2 = rng.choice(laby.get_contiguous_cells(c1))
+        laby.add_wall(c1, c2)
+    return laby
+
+
+def random_cells(laby: Maze, rng, count: int) -> list:
+    """
+    Tire count couples de cellules
+    """
+    cell = lambda: (rng.randrange(laby.height), rng.randrange(laby.width))
+    return [(cell(), cell()) for _ in range(count)]
+
+
+def sample_mazes():
+    """
+    Labyrinthes de test : parfaits, tressés (avec cycles) et coupés (en plusieurs composantes)
+    """
+    rng = random.Random(7)
+    for name in GENERATORS:
+        yield name, getattr(Maze, name)(11, 14, seed=3)
+        yield name + " tressé", braid(getattr(Maze, name)(11, 14, seed=4), rng, 25, 0)
+        yield name + " coupé", braid(getattr(Maze, name)(11, 14, seed=5), rng, 10, 12)
+
+
+class LegacyGeneratorsTest(unittest.TestCase):
+    """
+    Les générateurs appelés sans seed ni rng tirent dans le module random exactement
+    comme la version d'origine : mêmes labyrinthes après random.seed (gen_wilson excepté,
+    comparé à son tirage post-user-004)
+    """
+    def test_legacy_output(self):
+        for (name, height, width), expected in {**LEGACY, **POST_USER_004}.items():
+            with self.subTest(generator=name, height=height, width=width):
+                random.seed(42)
+                self.assertEqual(fingerprint(getattr(Maze, name)(height, width)), expected)
+
+    def test_seeded_generators(self):
+        for name in GENERATORS + ("gen_eller", "gen_prim"):
+            with self.subTest(generator=name):
+                laby = getattr(Maze, name)(13, 17, seed=5)
+                self.assertEqual(bytes(laby._cells), bytes(getattr(Maze, name)(13, 17, seed=5)._cells))
+                self.assertTrue(laby.is_perfect())
+
+
+class SolversTest(unittest.TestCase):
+    """
+    Chemins valides (cellules voisines reliées, de start à end) et, pour les solveurs
+    de plus court chemin, de la longueur donnée par le parcours de référence
+    """
+    SHORTEST = ("solve_bfs", "solve_astar", "solve_bidirectional")
+
+    def check_path(self, laby: Maze, path, start: tuple, end: tuple, expected, shortest: bool):
+        if expected is None:
+            self.assertIsNone(path)
+            return
+        self.assertIsNotNone(path)
+        self.assertEqual((path[0], path[-1]), (start, end))
+        for c1, c2 in zip(path, path[1:]):
+            self.assertIn(c2, laby.neighbors[c1])
+        if shortest:
+            self.assertEqual(len(path) - 1, expected)
+
+    def test_solvers(self):
+        rng = random.Random(1)
+        for label, laby in sample_mazes():
+            graph = laby.junction_graph()
+            for start, end in random_cells(laby, rng, 15):
+                expected = reference_distances(laby, start).get(end)
+                with self.subTest(maze=label, start=start, end=end):
+                    for solver in self.SHORTEST + ("solve_dfs",):
+                        result = getattr(laby, solver)(start, end)
+                        self.check_path(laby, result.path, start, end, expected, solver in self.SHORTEST)
+                    for solve in (graph.solve_dijkstra, graph.solve_astar):
+                        self.check_path(laby, solve(start, end).path, start, end, expected, True)
+                    self.assertEqual(graph.distance(start, end), expected)
+
+    def test_solve_many(self):
+        rng = random.Random(4)
+        for label, laby in sample_mazes():
+            pairs = random_cells(laby, rng, 12)
+            with self.subTest(maze=label):
+                for (start, end), path in zip(pairs, laby.solve_many(pairs)):
+                    self.check_path(laby, path, start, end, reference_distances(laby, start).get(end), True)
+
+    def test_tree_index_cycle(self):
+        # n-1 passages sans être un arbre : un cycle de 2 x 2 et la cellule (2, 2) isolée
+        laby = Maze(3, 3)
+        for c1, c2 in (((0, 0), (0, 1)), ((0, 1), (1, 1)), ((1, 1), (1, 0)), ((1, 0), (0, 0)),
+                       ((0, 1), (0, 2)), ((0, 2), (1, 2)), ((1, 0), (2, 0)), ((2, 0), (2, 1))):
+            laby.remove_wall(c1, c2)
+        self.assertIsNone(laby.tree_index())
+        pairs = [((0, 0), (2, 1)), ((1, 1), (0, 2)), ((0, 0), (2, 2))]
+        for (start, end), path in zip(pairs, laby.solve_many(pairs)):
+            self.check_path(laby, path, start, end, reference_distances(laby, start).get(end), True)
+
+    def test_distance_map(self):
+        laby = braid(Maze.gen_wilson(9, 12, seed=2), random.Random(3), 10, 5)
+        distances = laby.distance_map((4, 4))
+        reference = reference_distances(laby, (4, 4))
+        for k, d in enumerate(distances):
+            self.assertEqual(d, reference.get(laby.cell_of(k), -1))
+
+
+class CacheTest(unittest.TestCase):
+    """
+    Le cache de résolution et les index tenus à jour (murs, graphe des carrefours)
+    restent exacts sous des modifications aléatoires
+    """
+    def test_random_edits(self):
+        rng = random.Random(11)
+        laby = Maze.gen_exploration(10, 10, seed=1)
+        laby.enable_cache()
+        sources = [(0, 0), (9, 9), (4, 5)]
+        for step in range(150):
+            c1 = (rng.randrange(10), rng.randrange(10))
+            c2 = rng.choice(laby.get_contiguous_cells(c1))
+            if rng.random() < 0.5:
+                laby.add_wall(c1, c2)
+            else:
+                laby.remove_wall(c1, c2)
+            source = rng.choice(sources)
+            reference = reference_distances(laby, source)
+            with self.subTest(step=step):
+                distances = laby.distance_map(source)
+                self.assertEqual([distances[k] for k in range(100)],
+                                 [reference.get(laby.cell_of(k), -1) for k in range(100)])
+                end = (rng.randrange(10), rng.randrange(10))
+                result = laby.solve_bfs(source, end)
+                self.assertEqual(len(result) - 1 if result.found else None, reference.get(end))
+                self.assertEqual(laby.wall_count(), len(laby.get_walls()))
+                self.assertEqual(laby.junction_graph().distance(source, end), reference.get(end))
+        self.assertGreater(laby.cache_stats()["hits"] + laby.cache_stats()["revalidated"], 0)
+
+    def test_returned_arrays_are_copies(self):
+        laby = Maze.gen_wilson(5, 5, seed=1)
+        laby.enable_cache()
+        distances = laby.distance_map((0, 0))
+        distances[24] = -1
+        self.assertNotEqual(laby.distance_map((0, 0))[24], -1)
+        laby.solve_bfs((0, 0), (4, 4)).predecessors[24] = -1
+        self.assertTrue(laby.solve_bfs((0, 0), (4, 4)).found)
+
+
+class WallsTest(unittest.TestCase):
+    """
+    Index des murs : has_wall, iter_walls, wall_count et random_wall d'accord avec get_walls
+    """
+    def test_walls(self):
+        rng = random.Random(5)
+        laby = braid(Maze.gen_fusion(8, 10, seed=2), rng, 12, 6)
+        walls = {tuple(w) for w in laby.get_walls()}
+        self.assertEqual({tuple(w) for w in laby.iter_walls()}, walls)
+        self.assertEqual(laby.wall_count(), len(walls))
+        for _ in range(50):
+            self.assertIn(tuple(laby.random_wall(rng)), walls)
+        for k in range(80):
+            c1 = laby.cell_of(k)
+            for c2 in laby.get_contiguous_cells(c1):
+                with self.subTest(c1=c1, c2=c2):
+                    self.assertEqual(laby.has_wall(c1, c2), c2 not in laby.neighbors[c1])
+                    self.assertEqual(laby.has_wall(c1, c2), tuple(sorted((c1, c2))) in walls)
+        self.assertFalse(laby.has_wall((0, 0), (1, 1)))
+
+    def test_has_wall_bounds(self):
+        laby = Maze(3, 3)
+        for c1, c2 in (((0, 0), (-1, 0)), ((0, 0), (0, -1)), ((2, 2), (3, 2)), ((2, 2), (2, 3))):
+            with self.subTest(c1=c1, c2=c2), self.assertRaises(AssertionError):
+                laby.has_wall(c1, c2)
+
+    def test_iter_walls_modified(self):
+        laby = Maze.gen_wilson(5, 5, seed=1)
+        walls = laby.iter_walls()
+        c1, c2 = next(walls)
+        laby.remove_wall(c1, c2)
+        with self.assertRaises(RuntimeError):
+            next(walls)
+
+
+class ValidationTest(unittest.TestCase):
+    """
+    Validateurs et connectivity comparés aux composantes du parcours de référence
+    """
+    def test_against_reference(self):
+        rng = random.Random(8)
+        for label, laby in sample_mazes():
+            n = laby.height*laby.width
+            # Composantes de référence : {cellule: plus petite cellule de sa composante}
+            component = {}
+            for k in range(n):
+                cell = laby.cell_of(k)
+                if cell not in component:
+                    for other in reference_distances(laby, cell):
+                        component[other] = cell
+            passages = sum(len(laby.neighbors[laby.cell_of(k)]) for k in range(n)) // 2
+            count = len(set(component.values()))
+            report = laby.validate()
+            uf = laby.connectivity()
+            with self.subTest(maze=label):
+                self.assertTrue(report["coherence"]["ok"] and report["orthogonal"]["ok"])
+                self.assertEqual(report["components"]["count"], count)
+                self.assertEqual(sorted(report["components"]["sizes"]),
+                                 sorted(list(component.values()).count(c) for c in set(component.values())))
+                labels = report["components"]["labels"]
+                for c1, c2 in random_cells(laby, rng, 30):
+                    same = component[c1] == component[c2]
+                    self.assertEqual(labels[laby.cell_id(c1)] == labels[laby.cell_id(c2)], same)
+                    self.assertEqual(uf.connected(laby.cell_id(c1), laby.cell_id(c2)), same)
+                self.assertEqual(report["cycles"]["count"], passages - n + count)
+                self.assertEqual(report["cycles"]["closing"] is None, report["cycles"]["count"] == 0)
+                self.assertEqual(report["perfect"], count == 1 and passages == n - 1)
+                self.assertEqual(laby.is_perfect(), report["perfect"])
+                self.assertEqual(uf.count, count)
+
+    def test_corrupted(self):
+        laby = Maze.gen_wilson(4, 5, seed=1)
+        laby._cells[7] |= 4
+        report = laby.validate()
+        self.assertEqual((report["coherence"]["ok"], report["coherence"]["first"]), (False, 7))
+        self.assertFalse(report["perfect"])
+
+        laby = Maze.gen_wilson(4, 5, seed=1)
+        laby._cells[9] |= 1
+        laby._cells[17] |= 2
+        report = laby.validate()
+        self.assertEqual((report["orthogonal"]["east_border"], report["orthogonal"]["south_border"]), (1, 1))
+        self.assertEqual(report["orthogonal"]["first"], 9)
+        self.assertFalse(laby.is_perfect())
+
+    def test_empty_shape(self):
+        self.assertFalse(Maze(0, 0).validate()["perfect"])
+        self.assertTrue(Maze(1, 1).validate()["perfect"])
+
+
+class MetricsTest(unittest.TestCase):
+    """
+    Statistiques comparées à un calcul exhaustif (toutes les paires par parcours de référence)
+    """
+    def test_perfect(self):
+        for name in GENERATORS:
+            laby = getattr(Maze, name)(9, 8, seed=3)
+            cells = [laby.cell_of(k) for k in range(72)]
+            distances = [reference_distances(laby, c) for c in cells]
+            stats = laby.metrics(rng=random.Random(0))
+            with self.subTest(generator=name):
+                self.assertTrue(stats["perfect"])
+                self.assertEqual(stats["diameter"], max(max(d.values()) for d in distances))
+                total = sum(d[c2] for d, c1 in zip(distances, cells) for c2 in cells if c1 < c2)
+                self.assertAlmostEqual(stats["mean_path"], total / (72*71/2))
+                self.assertEqual(stats["unreachable"], 0)
+
+    def test_disconnected(self):
+        # Deux moitiés de 1 x 4 séparées : aucun couple tiré n'est une cellule avec elle-même
+        laby = Maze(2, 4, empty=True)
+        for j in range(4):
+            laby.add_wall((0, j), (1, j))
+        stats = laby.metrics(pairs=200, rng=random.Random(1))
+        self.assertFalse(stats["perfect"])
+        self.assertGreater(stats["unreachable"], 0)
+        self.assertGreaterEqual(stats["mean_path"], 1)
+
+    def test_empty_shape(self):
+        self.assertEqual(set(Maze(0, 0).metrics()), set(Maze(2, 2).metrics()))
+
+
+class InstrumentationTest(unittest.TestCase):
+    """
+    Comptes de l'instrumentation, y compris pour un algorithme qui n'appelle aucune opération mesurée
+    """
+    def test_inside(self):
+        with Maze.instrument() as mesure:
+            Maze.gen_sidewinder(10, 10)
+            laby = Maze.gen_fusion(6, 6)
+            laby.get_walls()
+        stats = mesure.stats()
+        self.assertEqual(stats["inside"]["gen_sidewinder"].get("get_walls", 0), 0)
+        self.assertEqual(stats["operations"]["get_walls"]["calls"], 1)
+        # Hors du bloc, les méthodes d'origine sont rétablies
+        self.assertFalse(hasattr(Maze.get_walls, "__wrapped__"))
+
+    def test_subclass(self):
+        from app.LazyMaze import LazyMaze
+
+        before = dict(vars(LazyMaze))
+        with LazyMaze.instrument() as mesure:
+            laby = LazyMaze(20, 20, seed=1)
+            laby.get_contiguous_cells((5, 5))
+            laby.solve_astar((0, 0), (19, 19))
+            # Seule la sous-classe est mesurée
+            Maze.gen_btree(3, 3, seed=1).get_walls()
+        stats = mesure.stats()
+        self.assertEqual(stats["operations"]["get_contiguous_cells"]["calls"], 1)
+        self.assertEqual(stats["operations"]["solve_astar"]["calls"], 1)
+        self.assertNotIn("get_walls", stats["operations"])
+        self.assertEqual(vars(LazyMaze), before)
+        self.assertFalse(hasattr(LazyMaze.add_wall, "__wrapped__"))
+        self.assertIs(LazyMaze.solve_astar, Maze.solve_astar)
+
+
+class PipelineTest(unittest.TestCase):
+    """
+    Exécution en lot : une ligne illisible donne un enregistrement d'erreur sans arrêter le lot
+    """
+    def test_bad_lines(self):
+        from app import Pipeline
+
+        lines = [
+            "/solve_bfs",
+            "/gen_btree 4 4 1",
+            "/add_wall 0 0",
+            "/solve_bfs",
+            '{"algorithm": "gen_wilson", "height": 3',
+            "/gen_wilson 5 5 2",
+            "/bogus",
+            "/gen_exploration 3 x",
+            "/validate",
+            '{"algorithm": "gen_prim", "height": 4, "width": 4, "seed": 1, "validate": true}',
+        ]
+        records = list(Pipeline.run(Pipeline.read_jobs(lines)))
+        self.assertEqual([r["id"] for r in records], list(range(6)))
+        self.assertEqual(["error" in r for r in records], [True, True, True, True, True, False])
+        self.assertIn("ligne 3", records[1]["error"])
+        self.assertTrue(records[5]["validate"]["perfect"])
+
+    def test_solve_length(self):
+        from app import Pipeline
+
+        job = {"algorithm": "gen_wilson", "height": 6, "width": 7, "seed": 3,
+               "solve": ["solve_bfs", {"solver": "solve_astar", "start": [2, 2], "end": [2, 2]}]}
+        record = Pipeline.run_job(job)
+        laby = Maze.gen_wilson(6, 7, seed=3)
+        # Même unité que Metrics : des pas, pas des cellules
+        self.assertEqual(record["solve"]["solve_bfs"]["length"], reference_distances(laby, (0, 0))[(5, 6)])
+        self.assertEqual(record["solve"]["solve_astar"]["length"], 0)
+
+
+class TiledTest(unittest.TestCase):
+    """
+    Génération par tuiles : labyrinthe parfait, indépendant du nombre de processus
+    """
+    def test_perfect(self):
+        for algorithm in ("gen_exploration", "gen_wilson", "gen_fusion", "gen_btree", "gen_prim"):
+            for height, width, tile in ((1, 1, 4), (9, 9, 3), (10, 23, 4), (17, 5, 16), (8, 8, 1)):
+                with self.subTest(algorithm=algorithm, height=height, width=width, tile=tile):
+                    laby = Maze.gen_tiled(height, width, algorithm, tile=tile, workers=1, seed=2)
+                    report = laby.validate()
+                    self.assertTrue(report["perfect"], report)
+                    self.assertEqual(bytes(laby._cells),
+                                     bytes(Maze.gen_tiled(height, width, algorithm, tile=tile, workers=1, seed=2)._cells))
+
+    def test_workers(self):
+        single = Maze.gen_tiled(40, 50, tile=16, workers=1, seed=7)
+        self.assertEqual(bytes(Maze.gen_tiled(40, 50, tile=16, workers=2, seed=7)._cells), bytes(single._cells))
+        self.assertNotEqual(bytes(Maze.gen_tiled(40, 50, tile=16, workers=1, seed=8)._cells), bytes(single._cells))
+
+
+class BatchTest(unittest.TestCase):
+    """
+    Génération en série : labyrinthes parfaits et distincts, ne dépendant que de seed
+    """
+    def test_batch(self):
+        from app import Generators
+
+        for algorithm in Generators.KERNELS:
+            with self.subTest(algorithm=algorithm):
+                mazes = list(Maze.generate_batch(11, 6, 7, algorithm, seed=3, chunk=4))
+                self.assertEqual(len(mazes), 11)
+                for laby in mazes:
+                    self.assertEqual((laby.height, laby.width), (6, 7))
+                    self.assertTrue(laby.validate()["perfect"])
+                self.assertGreater(len({bytes(laby._cells) for laby in mazes}), 1)
+                again = Maze.generate_batch(11, 6, 7, algorithm, seed=3, chunk=4)
+                self.assertEqual([bytes(laby._cells) for laby in again], [bytes(laby._cells) for laby in mazes])
+
+    def test_workers(self):
+        single = [bytes(laby._cells) for laby in Maze.generate_batch(9, 8, 8, seed=5, chunk=2)]
+        self.assertEqual([bytes(laby._cells) for laby in Maze.generate_batch(9, 8, 8, seed=5, chunk=2, workers=2)], single)
+        self.assertEqual(list(Maze.generate_batch(0, 8, 8, seed=5)), [])
+        with self.assertRaises(AssertionError):
+            list(Maze.generate_batch(2, 3, 3, "gen_tiled"))
+
+
+class MazeCacheTest(unittest.TestCase):
+    """
+    Cache sur disque : un labyrinthe généré une fois est relu à l'identique
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_or_generate(self):
+        from app.MazeCache import MazeCache
+
+        cache = MazeCache(self.directory.name)
+        self.assertIsNone(cache.get("gen_wilson", 9, 7, 4))
+        first = cache.get_or_generate("gen_wilson", 9, 7, 4)
+        self.assertEqual(bytes(first._cells), bytes(Maze.gen_wilson(9, 7, seed=4)._cells))
+        for mapped in (False, True):
+            with self.subTest(mapped=mapped):
+                laby = cache.get_or_generate("gen_wilson", 9, 7, 4, mapped=mapped)
+                self.assertEqual(bytes(laby._cells[:]), bytes(first._cells))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        # Chaque élément du quadruplet change l'adresse
+        other = cache.get_or_generate("gen_exploration", 9, 7, 4)
+        self.assertNotEqual(bytes(other._cells), bytes(first._cells))
+        keys = {MazeCache.key(*item) for item in (("gen_wilson", 9, 7, 4), ("gen_wilson", 7, 9, 4),
+                                                  ("gen_wilson", 9, 7, 5), ("gen_exploration", 9, 7, 4))}
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(cache.misses, 2)
+        leftovers = [name for _, _, names in os.walk(self.directory.name) for name in names if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_seed_required(self):
+        from app.MazeCache import MazeCache
+
+        with self.assertRaises(AssertionError):
+            MazeCache(self.directory.name).get_or_generate("gen_wilson", 3, 3, None)
+
+
+class LazyMazeTest(unittest.TestCase):
+    """
+    Labyrinthe procédural : parfait, identique quel que soit l'ordre des lectures,
+    en lecture seule et sans les constructeurs de Maze
+    """
+    def test_procedural(self):
+        from app.LazyMaze import LazyMaze
+
+        for algorithm in ("btree", "sidewinder"):
+            with self.subTest(algorithm=algorithm):
+                laby = LazyMaze(12, 9, algorithm, seed=4, cache_rows=2)
+                full = laby.region(0, 0, 12, 9)
+                self.assertTrue(full.is_perfect())
+                # Lectures dans le désordre avec un cache de deux lignes : mêmes murs
+                again = LazyMaze(12, 9, algorithm, seed=4, cache_rows=2)
+                order = list(range(12*9))
+                random.Random(2).shuffle(order)
+                self.assertEqual(bytes(again._cells[k] for k in order), bytes(full._cells[k] for k in order))
+                self.assertNotEqual(bytes(LazyMaze(12, 9, algorithm, seed=5)._cells), bytes(full._cells))
+                for start, end in random_cells(full, random.Random(3), 10):
+                    expected = reference_distances(full, start)[end]
+                    self.assertEqual(len(laby.solve_astar(start, end)) - 1, expected)
+                    self.assertEqual(len(laby.solve_bidirectional(start, end)) - 1, expected)
+
+    def test_region(self):
+        from app.LazyMaze import LazyMaze
+
+        laby = LazyMaze(10, 10, "sidewinder", seed=1)
+        full = laby.region(0, 0, 10, 10)
+        zone = laby.region(3, 2, 4, 5)
+        for i in range(4):
+            for j in range(5):
+                inside = {(a - 3, b - 2) for a, b in full.neighbors[(i + 3, j + 2)]
+                          if 0 <= a - 3 < 4 and 0 <= b - 2 < 5}
+                self.assertEqual(zone.neighbors[(i, j)], inside)
+
+    def test_read_only(self):
+        from app.LazyMaze import LazyMaze
+
+        laby = LazyMaze(4, 4, seed=1)
+        for edit in (lambda: laby.add_wall((3, 0), (3, 1)), laby.fill, laby.empty):
+            with self.assertRaises(TypeError):
+                edit()
+
+    def test_constructors(self):
+        from app.LazyMaze import LazyMaze
+
+        calls = {
+            "gen_btree": (3, 3), "gen_sidewinder": (3, 3), "gen_fusion": (3, 3),
+            "gen_exploration": (3, 3), "gen_wilson": (3, 3), "gen_eller": (3, 3), "gen_prim": (3, 3),
+        }
+        for name, args in calls.items():
+            for kwargs in ({}, {"seed": 1}):
+                with self.subTest(constructor=name, **kwargs), self.assertRaises(TypeError):
+                    getattr(LazyMaze, name)(*args, **kwargs)
+        with self.assertRaises(TypeError):
+            LazyMaze.from_text(str(Maze.gen_btree(3, 3, seed=1)))
+        with self.assertRaises(TypeError):
+            LazyMaze.load("inutile.maze")
+        with self.assertRaises(TypeError):
+            list(LazyMaze.generate_batch(2, 3, 3, seed=1))
+
+
+def btree_reference(coins) -> Maze:
+    """
+    Arbre binaire en Python pur, cellule par cellule comme gen_btree :
+    coins[i][j] vrai pour préférer le sud, faux pour l'est
+    """
+    height, width = len(coins), len(coins[0])
+    laby = Maze(height, width)
+    for i in range(height):
+        for j in range(width):
+            south = (i+1, j) if i < height-1 else None
+            east = (i, j+1) if j < width-1 else None
+            choice = (south or east) if coins[i][j] else (east or south)
+            if choice:
+                laby.remove_wall((i, j), choice)
+    return laby
+
+
+def sidewinder_reference(closes, draws, width: int) -> Maze:
+    """
+    Sidewinder en Python pur, séquence par séquence comme gen_sidewinder : closes[i][j] vrai
+    pour fermer la séquence en (i, j), draws fournit un réel de [0, 1[ par séquence
+    """
+    height = len(closes) + 1
+    laby = Maze(height, width)
+    draws = iter(draws)
+    for i in range(height-1):
+        start = 0
+        for j in range(width):
+            if j == width-1 or closes[i][j]:
+                length = j - start + 1
+                pick = start + min(int(next(draws) * length), length - 1)
+                laby.remove_wall((i, pick), (i+1, pick))
+                start = j+1
+            else:
+                laby.remove_wall((i, j), (i, j+1))
+    for j in range(width-1):
+        laby.remove_wall((height-1, j), (height-1, j+1))
+    return laby
+
+
+class RenderTest(unittest.TestCase):
+    """
+    Rendu texte ligne par ligne : iter_lines et write_to donnent exactement overlay
+    """
+    def test_rows(self):
+        for height, width in ((1, 1), (1, 6), (5, 1), (7, 9)):
+            laby = braid(Maze.gen_wilson(height, width, seed=1), random.Random(2), 3, 0)
+            content = {laby.cell_of(k): "*" for k in range(0, height*width, 3)}
+            for cells in (None, content):
+                with self.subTest(height=height, width=width, content=bool(cells)):
+                    self.assertEqual("\n".join(laby.iter_lines(cells)) + "\n", laby.overlay(cells))
+                    output = io.StringIO()
+                    laby.write_to(output, cells)
+                    self.assertEqual(output.getvalue(), laby.overlay(cells))
+                    self.assertEqual(bytes(Maze.from_text(output.getvalue())._cells), bytes(laby._cells))
+        self.assertEqual(str(laby), laby.overlay())
+
+
+class EllerPrimTest(unittest.TestCase):
+    """
+    Eller et Prim : labyrinthes parfaits ; le rendu d'Eller écrit au fil des lignes est celui de gen_eller
+    """
+    SHAPES = ((1, 1), (1, 8), (9, 1), (2, 2), (12, 15), (30, 4))
+
+    def test_perfect(self):
+        for name in ("gen_eller", "gen_prim"):
+            for height, width in self.SHAPES:
+                with self.subTest(generator=name, height=height, width=width):
+                    self.assertTrue(getattr(Maze, name)(height, width, seed=height*width).validate()["perfect"])
+
+    def test_stream_eller(self):
+        for height, width in self.SHAPES:
+            with self.subTest(height=height, width=width):
+                output = io.StringIO()
+                Maze.stream_eller(output, height, width, seed=6)
+                self.assertEqual(output.getvalue(), str(Maze.gen_eller(height, width, seed=6)))
+                output = io.StringIO()
+                Maze.stream_eller(output, height, width, rng=random.Random(2))
+                self.assertEqual(output.getvalue(), str(Maze.gen_eller(height, width, rng=random.Random(2))))
+                random.seed(3)
+                output = io.StringIO()
+                Maze.stream_eller(output, height, width)
+                random.seed(3)
+                self.assertEqual(output.getvalue(), str(Maze.gen_eller(height, width)))
+
+
+class VectorizedTest(unittest.TestCase):
+    """
+    Générateurs NumPy comparés à une version en Python pur qui consomme les mêmes tirages
+    """
+    def setUp(self):
+        from app import Vectorized
+
+        if Vectorized.np is None:
+            self.skipTest("NumPy n'est pas installé")
+        self.Vectorized = Vectorized
+        self.np = Vectorized.np
+
+    SHAPES = ((1, 1), (1, 9), (8, 1), (2, 2), (13, 17), (31, 8))
+
+    def test_btree(self):
+        for height, width in self.SHAPES:
+            with self.subTest(height=height, width=width):
+                coins = self.Vectorized._coins(self.np.random.default_rng(3), (height, width)).tolist()
+                laby = Maze.from_arrays(*self.Vectorized.btree_arrays(height, width, seed=3))
+                self.assertEqual(bytes(laby._cells), bytes(btree_reference(coins)._cells))
+                self.assertTrue(laby.is_perfect())
+
+    def test_sidewinder(self):
+        for height, width in self.SHAPES:
+            with self.subTest(height=height, width=width):
+                rng = self.np.random.default_rng(4)
+                closes, draws = [], []
+                if height > 1 and width > 1:
+                    closes = self.Vectorized._coins(rng, (height-1, width-1)).tolist()
+                elif height > 1:
+                    closes = [[] for _ in range(height-1)]
+                if height > 1:
+                    count = sum(map(sum, closes)) + height-1
+                    draws = rng.random(count, dtype=self.np.float32).tolist()
+                laby = Maze.gen_sidewinder_numpy(height, width, seed=4)
+                self.assertEqual(bytes(laby._cells), bytes(sidewinder_reference(closes, draws, width)._cells))
+                self.assertTrue(laby.is_perfect())
+
+    def test_cells_round_trip(self):
+        laby = braid(Maze.gen_wilson(9, 11, seed=1), random.Random(1), 8, 0)
+        east, south = self.Vectorized.from_cells(laby._cells, 9, 11)
+        self.assertEqual(east.shape, (9, 11))
+        self.assertEqual(bytes(Maze.from_arrays(east, south)._cells), bytes(laby._cells))
+
+
+def read_image(path: str) -> tuple:
+    """
+    Décode une image écrite par to_image : retourne (largeur, hauteur, lignes de pixels),
+    chaque pixel valant son niveau (0 ou 1 en PBM, 0 à 255 en PGM, 0 à 2**profondeur-1 en PNG)
+    """
+    with open(path, "rb") as fileobj:
+        data = fileobj.read()
+    if data.startswith((b"P4", b"P5")):
+        fields = data.split(b"\n", 3 if data.startswith(b"P5") else 2)
+        width, height = map(int, fields[1].split())
+        raw = fields[-1]
+        if data.startswith(b"P5"):
+            return width, height, [list(raw[y*width:(y+1)*width]) for y in range(height)]
+        depth = 1
+    else:
+        assert data.startswith(b"\x89PNG\r\n\x1a\n")
+        pos, idat = 8, b""
+        while pos < len(data):
+            size, kind = struct.unpack(">I4s", data[pos:pos+8])
+            body = data[pos+8:pos+8+size]
+            assert struct.unpack(">I", data[pos+8+size:pos+12+size])[0] == zlib.crc32(kind + body)
+            if kind == b"IHDR":
+                width, height, depth = struct.unpack(">IIB", body[:9])
+            elif kind == b"IDAT":
+                idat += body
+            pos += 12 + size
+        raw = zlib.decompress(idat)
+    stride = (width*depth + 7) // 8
+    if not data.startswith(b"P4"):
+        # Un octet de filtre (0) en tête de chaque ligne du PNG
+        assert all(raw[y*(stride+1)] == 0 for y in range(height))
+        raw = b"".join(raw[y*(stride+1)+1:(y+1)*(stride+1)] for y in range(height))
+    mask = (1 << depth) - 1
+    rows = []
+    for y in range(height):
+        line = raw[y*stride:(y+1)*stride]
+        rows.append([line[x*depth // 8] >> (8 - depth - x*depth % 8) & mask for x in range(width)])
+    return width, height, rows
+
+
+class ImageTest(unittest.TestCase):
+    """
+    Export en image : chaque format relu pixel par pixel donne les murs et le chemin du labyrinthe
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check(self, laby: Maze, rows: list, px: int, is_open, is_path=None):
+        """
+        Vérifie les pixels significatifs : intérieurs ouverts, coins fermés, murs est et sud
+        selon has_wall, cellules du chemin tracées
+        """
+        for i in range(laby.height):
+            for j in range(laby.width):
+                y, x = i*px + 1, j*px + 1
+                self.assertTrue(is_open(rows[y][x]) or (is_path and is_path(rows[y][x])))
+                self.assertFalse(is_open(rows[i*px][j*px]))
+                east = rows[y][(j+1)*px]
+                south = rows[(i+1)*px][x]
+                if is_path is None or not is_path(east):
+                    self.assertEqual(is_open(east), j < laby.width-1 and not laby.has_wall((i, j), (i, j+1)))
+                if is_path is None or not is_path(south):
+                    self.assertEqual(is_open(south), i < laby.height-1 and not laby.has_wall((i, j), (i+1, j)))
+
+    def test_formats(self):
+        laby = braid(Maze.gen_wilson(7, 11, seed=3), random.Random(3), 6, 0)
+        for px in (2, 3, 5):
+            for extension, is_open in (("pbm", lambda v: v == 0), ("pgm", lambda v: v == 255), ("png", lambda v: v == 1)):
+                path = os.path.join(self.directory.name, f"laby.{extension}")
+                laby.to_image(path, cell_px=px)
+                width, height, rows = read_image(path)
+                with self.subTest(format=extension, cell_px=px):
+                    self.assertEqual((width, height), (11*px + 1, 7*px + 1))
+                    self.check(laby, rows, px, is_open)
+
+    def test_path(self):
+        laby = Maze.gen_exploration(9, 8, seed=2)
+        solution = laby.solve_bfs((0, 0), (8, 7)).path
+        for extension, is_open, is_path in (("pgm", lambda v: v == 255, lambda v: v == 170),
+                                            ("png", lambda v: v == 3, lambda v: v == 2)):
+            path = os.path.join(self.directory.name, f"chemin.{extension}")
+            laby.to_image(path, cell_px=4, path=solution)
+            _, _, rows = read_image(path)
+            with self.subTest(format=extension):
+                self.check(laby, rows, 4, is_open, is_path)
+                marked = {(i, j) for i in range(9) for j in range(8) if is_path(rows[i*4 + 1][j*4 + 1])}
+                self.assertEqual(marked, set(solution))
+                # Le passage entre deux cellules consécutives du chemin est tracé
+                for (i1, j1), (i2, j2) in zip(solution, solution[1:]):
+                    y, x = max(i1, i2)*4 if i1 != i2 else i1*4 + 1, max(j1, j2)*4 if j1 != j2 else j1*4 + 1
+                    self.assertTrue(is_path(rows[y][x]))
+
+    def test_errors(self):
+        laby = Maze.gen_btree(3, 3, seed=1)
+        with self.assertRaises(ValueError):
+            laby.to_image(os.path.join(self.directory.name, "laby.jpg"))
+        with self.assertRaises(ValueError):
+            laby.to_image(os.path.join(self.directory.name, "laby.pbm"), path=[(0, 0), (0, 1)])
+
+
+class RoundTripTest(unittest.TestCase):
+    """
+    save / load (lu ou projeté en mémoire) et from_text restituent les mêmes murs
+    """
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".maze")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_save_load(self):
+        for height, width in ((1, 1), (1, 7), (6, 1), (9, 13), (16, 16)):
+            laby = braid(Maze.gen_wilson(height, width, seed=height), random.Random(width), 3, 0)
+            laby.save(self.path)
+            with self.subTest(height=height, width=width):
+                self.assertEqual(bytes(Maze.load(self.path)._cells), bytes(laby._cells))
+                mapped = Maze.load(self.path, mapped=True)
+                self.assertEqual((mapped.height, mapped.width), (height, width))
+                self.assertEqual(bytes(mapped._cells[:]), bytes(laby._cells))
+                self.assertEqual(str(mapped), str(laby))
+
+    def test_mapped_writable(self):
+        laby = Maze.gen_exploration(7, 9, seed=2)
+        laby.save(self.path)
+        mapped = Maze.load(self.path, mapped=True, writable=True)
+        c1, c2 = laby.random_wall(random.Random(0))
+        mapped.remove_wall(c1, c2)
+        laby.remove_wall(c1, c2)
+        self.assertEqual(bytes(Maze.load(self.path)._cells), bytes(laby._cells))
+
+    def test_mapped_fill_empty(self):
+        for height, width in ((1, 1), (3, 5), (7, 9)):
+            Maze.gen_wilson(height, width, seed=1).save(self.path)
+            mapped = Maze.load(self.path, mapped=True, writable=True)
+            with self.subTest(height=height, width=width):
+                mapped.empty()
+                self.assertEqual(bytes(Maze.load(self.path)._cells), bytes(Maze(height, width, empty=True)._cells))
+                mapped.fill()
+                self.assertEqual(bytes(Maze.load(self.path)._cells), bytes(height*width))
+        with self.assertRaises(TypeError):
+            Maze.load(self.path, mapped=True).empty()
+
+    def test_truncated_file(self):
+        Maze.gen_wilson(20, 20, seed=1).save(self.path)
+        with open(self.path, "r+b") as fileobj:
+            fileobj.truncate(30)
+        for mapped in (False, True):
+            with self.subTest(mapped=mapped), self.assertRaises(AssertionError):
+                Maze.load(self.path, mapped=mapped)
+
+    def test_from_text(self):
+        for name in GENERATORS:
+            laby = braid(getattr(Maze, name)(8, 11, seed=6), random.Random(6), 6, 4)
+            with self.subTest(generator=name):
+                self.assertEqual(bytes(Maze.from_text(str(laby))._cells), bytes(laby._cells))
+                self.assertEqual(bytes(Maze.from_text(laby.overlay({(0, 0): "D"}))._cells), bytes(laby._cells))
+
+
+if __name__ == "__main__":
+    unittest.main()
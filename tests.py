@@ -1,5 +1,12 @@
+import sys
+
 from app.Maze import Maze
 
+# Avec un fichier en argument, exécution en lot sans interface (voir app/Pipeline.py)
+if len(sys.argv) > 1:
+    from app import Pipeline
+    sys.exit(Pipeline.main(sys.argv[1:]))
+
 print("""
     _______       _______             __   
     |   _   .--.--|       .-----.-----|  |_ 